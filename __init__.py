@@ -75,14 +75,18 @@ class Orbit(object):
         Qpqw2eci = self.getQpqw2eci()
         return Qpqw2eci.dot(rPqw)
         
-    def getRlla(self, t_dt=None):
+    def getRlla(self, t_dt=None, isGeodetic=False):
         """Computes and returns the position at the given datetime, in latitude,
            longitude, and altitude (radians, radians, and meters, respectively).
+           These are spherical unless *isGeodetic* is set, in which case they
+           are relative to the oblate spheroid used by *earth.lla2eci*.
         """
         if t_dt is None:
             t_dt = self.tEpoch_dt
         rEci_m = self.getReci(t_dt)
         rEcf_m = earth.getQeci2ecf(t_dt).dot(rEci_m)
+        if isGeodetic:
+            return earth.ecf2lla(rEcf_m)
         rLla_radm = rot.xyz2sph(rEcf_m)
         return numpy.array([rLla_radm[1], rLla_radm[0], rLla_radm[2] - earth.eqRad_m])
         
@@ -126,32 +130,76 @@ class Orbit(object):
         self.a_m = 0.5 * (rPer_m + rApo_m)
         self.e = (rApo_m - rPer_m) / (rApo_m + rPer_m)
         
-    def propagate(self, tEpoch_dt=None, T_s=None, nSamples=1000):
-        """Computes inertial position over the course of one orbit, beginning
-           with the given datetime (or, if not provided, the element epoch).
-           This defaults to 1,000 samples within that time range.
+    def getSampleTimes(self, tEpoch_dt=None, T_s=None, nSamples=1000, spacing='time', tol_m=None):
+        """Returns an array of sample times, in seconds from the given datetime
+           (or, if not provided, the element epoch), spanning *T_s* seconds
+           (one orbit by default). With 'time' spacing these are the
+           *nSamples* uniform samples of *propagate*; 'eccentric' and 'true'
+           spacing place *nSamples* uniformly in that anomaly instead, which
+           concentrates them around perigee. With 'chord' spacing, the fewest
+           samples are placed (ignoring *nSamples*) such that the chord between
+           neighboring samples deviates from the inertial two-body arc by no
+           more than *tol_m* meters, from the arc's local curvature.
         """
         if tEpoch_dt is None:
             tEpoch_dt = self.tEpoch_dt
         if T_s is None:
             T_s = self.getPeriod()
-        ti_s = numpy.linspace(0, T_s, nSamples)
+        if spacing == 'time':
+            return numpy.linspace(0, T_s, nSamples)
+        n_radps = 2 * pi / self.getPeriod()
+        M0_rad = self.M_rad + n_radps * (tEpoch_dt - self.tEpoch_dt).total_seconds()
+        E0_rad, E1_rad = anomaly.mean2eccArray(numpy.array([M0_rad, M0_rad + n_radps * T_s]), self.e)
+        if spacing == 'eccentric':
+            Ei_rad = numpy.linspace(E0_rad, E1_rad, nSamples)
+        elif spacing == 'true':
+            tht0_rad, tht1_rad = anomaly.ecc2trueUnwrapped(numpy.array([E0_rad, E1_rad]), self.e)
+            Ei_rad = anomaly.true2eccUnwrapped(numpy.linspace(tht0_rad, tht1_rad, nSamples), self.e)
+        elif spacing == 'chord':
+            if tol_m is None or tol_m <= 0:
+                raise ValueError('Chord spacing requires a positive tolerance (tol_m)')
+            b_m = self.a_m * (1 - self.e**2)**0.5
+            E_rad = numpy.linspace(E0_rad, E1_rad, int(numpy.ceil(4096 * (E1_rad - E0_rad) / (2 * pi))) + 2)
+            g_m = (self.a_m**2 * numpy.sin(E_rad)**2 + b_m**2 * numpy.cos(E_rad)**2)**0.5
+            density = (self.a_m * b_m / (8 * tol_m * g_m))**0.5
+            u = numpy.concatenate(([0], numpy.cumsum(0.5 * (density[1:] + density[:-1]) * numpy.diff(E_rad))))
+            Ei_rad = numpy.interp(numpy.linspace(0, u[-1], int(numpy.ceil(u[-1])) + 1), u, E_rad)
+        else:
+            raise ValueError('Unsupported sample spacing "%s"' % spacing)
+        ti_s = (anomaly.ecc2mean(Ei_rad, self.e) - M0_rad) / n_radps
+        ti_s[0], ti_s[-1] = 0, T_s
+        return ti_s
+
+    def propagate(self, tEpoch_dt=None, T_s=None, nSamples=1000, spacing='time', tol_m=None):
+        """Computes inertial position over the course of one orbit, beginning
+           with the given datetime (or, if not provided, the element epoch).
+           This defaults to 1,000 samples within that time range; samples may
+           instead be spaced by anomaly or chordal error. Row *i* is sampled at
+           *getSampleTimes(...)[i]* seconds from that datetime, for the same
+           arguments, so non-uniform sample times can be recovered by calling
+           *getSampleTimes* alongside.
+        """
+        if tEpoch_dt is None:
+            tEpoch_dt = self.tEpoch_dt
+        ti_s = self.getSampleTimes(tEpoch_dt, T_s, nSamples, spacing, tol_m)
         rEci_m = numpy.zeros((0,3))
         for t_s in ti_s:
             r = self.getReci(tEpoch_dt + datetime.timedelta(t_s/86400))
             rEci_m = numpy.append(rEci_m, r.reshape(1,-1), axis=0)
         return rEci_m
         
-    def track(self, tEpoch_dt=None, T_s=None, nSamples=1000):
+    def track(self, tEpoch_dt=None, T_s=None, nSamples=1000, spacing='time', tol_m=None):
         """Computes lat/lon/alt position over the course of one orbit, beginning
            with the given datetime (or, if not provided, the element epoch).
-           This defaults to 1,000 samples within that time range.
+           This defaults to 1,000 samples within that time range; samples may
+           instead be spaced by anomaly or chordal error. Row *i* is sampled at
+           *getSampleTimes(...)[i]* seconds from that datetime, for the same
+           arguments, so non-uniform sample times can be recovered by calling
+           *getSampleTimes* alongside.
         """
         if tEpoch_dt is None:
             tEpoch_dt = self.tEpoch_dt
-        if T_s is None:
-            T_s = self.getPeriod()
-        ti_s = numpy.linspace(0, T_s, nSamples)
+        ti_s = self.getSampleTimes(tEpoch_dt, T_s, nSamples, spacing, tol_m)
         rLla_radm = numpy.zeros((0,3))
         for t_s in ti_s:
             r = self.getRlla(tEpoch_dt + datetime.timedelta(t_s/86400))
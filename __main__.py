@@ -0,0 +1,8 @@
+"""Invokes the command-line interface defined in the *cli* module.
+"""
+
+import sys
+from oyb import cli
+
+if __name__ == '__main__':
+    sys.exit(cli.main())
@@ -1,19 +1,26 @@
-"""Defines conversions between various anomalies.
+"""Defines conversions between various anomalies, including selectable
+   strategies for solving Kepler's equation.
 """
 
-from math import pi, atan2, sin, cos, tan
+import numpy
+from math import pi, sin, cos
 
-def mean2ecc(M_rad, e):
+def mean2ecc(M_rad, e, starter='basic', method='newton', tol=1e-8):
     """Converts a mean (constant time-rate projection) anomaly into eccentric.
        This is the only non-procedural conversion (i.e., it is computed by
        numerical iteration), necessary to solve the transcendental Kepler's
-       equation for eccentric anomaly (M = E + e * sin(E)).
+       equation for eccentric anomaly (M = E + e * sin(E)). Arrays of mean
+       anomaly and/or eccentricity are solved together, and other solver
+       strategies may be selected (see *mean2eccArray*).
     """
+    if numpy.ndim(M_rad) > 0 or numpy.ndim(e) > 0:
+        return mean2eccArray(M_rad, e, starter, method, tol)
+    if starter != 'basic' or method != 'newton':
+        return float(mean2eccArray(M_rad, e, starter, method, tol))
     E_rad = M_rad + 0.5 * e
     if M_rad > pi:
         E_rad = M_rad - 0.5 * e
     r = 1
-    tol = 1e-8
     n = 0
     max = 1e3
     while abs(r) > tol and n < max:
@@ -26,25 +33,155 @@ def mean2ecc(M_rad, e):
         raise Exception('Failed to converge within %u iterations' % n)
     return E_rad
 
+def mean2eccArray(M_rad, e, starter='basic', method='newton', tol=1e-8):
+    """Solves Kepler's equation for an array of mean anomalies (and either a
+       single eccentricity or a broadcast-compatible array of them) with
+       whole-array iterations. The initial guess is taken from one of the
+       *starters* and refined by one of the *methods* until every correction
+       falls below *tol* (radians); since each method converges at least
+       quadratically, the returned anomalies are then within *tol* of the
+       exact solution (down to the ~1e-15 radian floor of double precision).
+    """
+    return solveKepler(M_rad, e, starter, method, tol)[0]
+
+def startBasic(M_rad, e):
+    """Returns the classic M +/- e/2 starter (mean anomaly in [-pi, pi]), with
+       a worst-case error of roughly 0.5 radians for e near 1.
+    """
+    return M_rad + 0.5 * e * numpy.sign(M_rad)
+
+def startCubic(M_rad, e):
+    """Returns Mikkola's (1987) cubic-approximation starter (mean anomaly in
+       [-pi, pi]), with a worst-case error below 4e-3 radians for e < 1.
+    """
+    d = 4 * e + 0.5
+    alpha = (1 - e) / d
+    beta = 0.5 * M_rad / d
+    z = numpy.cbrt(beta + numpy.sign(beta) * (beta**2 + alpha**3)**0.5)
+    s = numpy.where(z != 0, z - alpha / numpy.where(z != 0, z, 1), 0)
+    s = s - 0.078 * s**5 / (1 + e)
+    return M_rad + e * (3 * s - 4 * s**3)
+
+def startMarkley(M_rad, e):
+    """Returns Markley's (1995) Pade-approximant starter (mean anomaly in
+       [-pi, pi]), with a worst-case error below 5e-4 radians for e < 1.
+    """
+    alpha = (3 * pi**2 + 1.6 * pi * (pi - numpy.abs(M_rad)) / (1 + e)) / (pi**2 - 6)
+    d = 3 * (1 - e) + alpha * e
+    q = 2 * alpha * d * (1 - e) - M_rad**2
+    r = 3 * alpha * d * (d - 1 + e) * M_rad + M_rad**3
+    w = (numpy.abs(r) + (q**3 + r**2)**0.5)**(2 / 3)
+    return (2 * r * w / (w**2 + w * q + q**2) + M_rad) / d
+
+_table = {}
+
+def startTable(M_rad, e, nM=257, nE=129):
+    """Returns a starter bilinearly interpolated from a lookup table of exact
+       solutions over M in [0, pi] (on a cube-root spaced grid, to follow the
+       E ~ (6M)^(1/3) behavior near e = 1) and e in [0, 1] (uniform in
+       sqrt(1 - e), so rows crowd toward e = 1, where the transition from
+       E ~ M/(1 - e) narrows), computed once and cached, using the odd symmetry
+       of Kepler's equation. The worst-case error is below 1e-4 radians for
+       e < 0.9, 3e-4 for e < 0.99, 5e-4 for e < 0.999, and 2e-3 for e < 1.
+    """
+    if (nM, nE) not in _table:
+        Mi, yi = numpy.meshgrid(pi * numpy.linspace(0, 1, nM)**3, numpy.linspace(0, 1, nE), indexing='ij')
+        _table[(nM, nE)] = solveKepler(Mi, numpy.minimum(1 - (1 - yi)**2, 1 - 1e-12), 'cubic', 'danby', 1e-14)[0]
+    table = _table[(nM, nE)]
+    x = numpy.cbrt(numpy.abs(M_rad) / pi) * (nM - 1)
+    y = (1 - (1 - numpy.clip(e, 0, 1))**0.5) * (nE - 1)
+    i = numpy.minimum(x.astype(int), nM - 2)
+    j = numpy.minimum(y.astype(int), nE - 2)
+    fx, fy = x - i, y - j
+    E_rad = (table[i,j] * (1 - fx) * (1 - fy) + table[i+1,j] * fx * (1 - fy)
+        + table[i,j+1] * (1 - fx) * fy + table[i+1,j+1] * fx * fy)
+    return numpy.sign(M_rad) * E_rad
+
+def stepNewton(E_rad, M_rad, e):
+    """Returns the second-order (Newton) correction to the eccentric anomaly.
+    """
+    f0 = E_rad - e * numpy.sin(E_rad) - M_rad
+    return -f0 / (1 - e * numpy.cos(E_rad))
+
+def stepHalley(E_rad, M_rad, e):
+    """Returns the third-order (Halley) correction to the eccentric anomaly.
+    """
+    esinE, ecosE = e * numpy.sin(E_rad), e * numpy.cos(E_rad)
+    f0 = E_rad - esinE - M_rad
+    f1 = 1 - ecosE
+    return -f0 / (f1 - 0.5 * f0 * esinE / f1)
+
+def stepDanby(E_rad, M_rad, e):
+    """Returns the fourth-order (Danby and Burkardt) correction to the
+       eccentric anomaly.
+    """
+    esinE, ecosE = e * numpy.sin(E_rad), e * numpy.cos(E_rad)
+    f0 = E_rad - esinE - M_rad
+    f1 = 1 - ecosE
+    d1 = -f0 / f1
+    d2 = -f0 / (f1 + 0.5 * d1 * esinE)
+    return -f0 / (f1 + 0.5 * d2 * esinE + d2**2 * ecosE / 6)
+
+starters = {'basic': startBasic, 'cubic': startCubic, 'markley': startMarkley, 'table': startTable}
+methods = {'newton': stepNewton, 'halley': stepHalley, 'danby': stepDanby}
+
+def solveKepler(M_rad, e, starter='basic', method='newton', tol=1e-8, nMax=1000):
+    """Solves Kepler's equation for arrays of mean anomaly and eccentricity
+       with the named starter and iteration method, returning a tuple of the
+       eccentric anomalies and the number of iterations taken. Mean anomalies
+       may take any value; they are reduced to [-pi, pi) internally, and only
+       the elements that have not yet converged are iterated.
+    """
+    M_rad, e = numpy.broadcast_arrays(numpy.asarray(M_rad, dtype=float), numpy.asarray(e, dtype=float))
+    Mr_rad = (M_rad + pi) % (2 * pi) - pi
+    E_rad = starters[starter](Mr_rad, e).ravel()
+    step = methods[method]
+    Mf_rad = Mr_rad.ravel()
+    ef = e.ravel()
+    ndx = numpy.arange(E_rad.shape[0])
+    n = 0
+    while ndx.shape[0] > 0 and n < nMax:
+        n = n + 1
+        r = step(E_rad[ndx], Mf_rad[ndx], ef[ndx])
+        E_rad[ndx] += r
+        ndx = ndx[numpy.abs(r) > tol]
+    if ndx.shape[0] > 0:
+        raise Exception('Failed to converge within %u iterations' % n)
+    return E_rad.reshape(M_rad.shape) + (M_rad - Mr_rad), n
+
 def ecc2true(E_rad, e):
     """Converts an eccentric anomaly into true (angle from perigee in cartesian
        space).
     """
-    n = (1 + e)**0.5 * tan(0.5 * E_rad)
+    n = (1 + e)**0.5 * numpy.tan(0.5 * E_rad)
     d = (1 - e)**0.5
-    return 2 * atan2(n, d)
+    return 2 * numpy.arctan2(n, d)
     
 def true2ecc(tht_rad, e):
     """Converts a true (angle from perigee in cartesian space) into eccentric.
     """
-    n = (1 - e)**0.5 * tan(0.5 * tht_rad)
+    n = (1 - e)**0.5 * numpy.tan(0.5 * tht_rad)
     d = (1 + e)**0.5
-    return 2 * atan2(n, d)
+    return 2 * numpy.arctan2(n, d)
     
+def ecc2trueUnwrapped(E_rad, e):
+    """Converts an eccentric anomaly into true, continuously: any number of
+       whole revolutions in the eccentric anomaly carries over to the result.
+    """
+    beta = e / (1 + (1 - e**2)**0.5)
+    return E_rad + 2 * numpy.arctan2(beta * numpy.sin(E_rad), 1 - beta * numpy.cos(E_rad))
+
+def true2eccUnwrapped(tht_rad, e):
+    """Converts a true anomaly into eccentric, continuously (the inverse of
+       *ecc2trueUnwrapped*).
+    """
+    beta = e / (1 + (1 - e**2)**0.5)
+    return tht_rad - 2 * numpy.arctan2(beta * numpy.sin(tht_rad), 1 + beta * numpy.cos(tht_rad))
+
 def ecc2mean(E_rad, e):
     """Converts an eccentric anomaly into mean (constant time-rate projection).
     """
-    return E_rad - e * sin(E_rad)
+    return E_rad - e * numpy.sin(E_rad)
     
 def true2mean(tht_rad, e):
     """Converts a true (angle from perigee in cartesian space) into mean
@@ -0,0 +1,50 @@
+"""Defines benchmarks of performance-sensitive package components, reporting
+   iteration counts and throughput. Run all benchmarks with:
+
+       python -m oyb.bench
+"""
+
+import time
+import numpy
+from oyb import anomaly
+
+def getRate(f, nRepeat=3):
+    """Returns the best-of-*nRepeat* wall time (seconds) of calling *f* with no
+       arguments, along with the last return value.
+    """
+    best_s = None
+    for _ in range(nRepeat):
+        tStart = time.perf_counter()
+        result = f()
+        dt_s = time.perf_counter() - tStart
+        best_s = dt_s if best_s is None else min(best_s, dt_s)
+    return best_s, result
+
+def benchKepler(e, n=100000, tol=1e-10, nRepeat=3):
+    """Solves Kepler's equation for *n* uniformly-spaced mean anomalies at the
+       given eccentricity with every starter/method pair, returning a list of
+       (starter, method, iterations, solutions per second, maximum error in
+       radians) tuples.
+    """
+    M_rad = numpy.linspace(0, 2 * numpy.pi, n, endpoint=False)
+    E_rad = anomaly.solveKepler(M_rad, e, 'markley', 'danby', 1e-15)[0]
+    anomaly.startTable(M_rad[:1], e)
+    results = []
+    for starter in sorted(anomaly.starters):
+        for method in sorted(anomaly.methods):
+            dt_s, (Ei_rad, nIter) = getRate(lambda: anomaly.solveKepler(M_rad, e, starter, method, tol), nRepeat)
+            results.append((starter, method, nIter, n / dt_s, numpy.max(numpy.abs(Ei_rad - E_rad))))
+    return results
+
+def main():
+    """Runs and prints all benchmarks.
+    """
+    cases = [('near-circular', 0.01), ('GTO', 0.73), ('COSMOS 2510 (test.tle)', 0.7125849), ('Molniya', 0.74105), ('highly eccentric', 0.97)]
+    for name, e in cases:
+        print('Kepler solvers, %s (e = %g):' % (name, e))
+        print('    %-8s %-7s %5s %14s %10s' % ('starter', 'method', 'iter', 'solutions/s', 'max err'))
+        for starter, method, nIter, rate, err in benchKepler(e):
+            print('    %-8s %-7s %5u %14.4g %10.2g' % (starter, method, nIter, rate, err))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+"""Defines a propagation cache for repeated evaluation of a catalog over the same
+   time grid (e.g., hourly refreshes of mostly-unchanged TLEs). Ephemerides are
+   keyed by a stable hash of each object's elements, epoch, model, frame, and
+   time grid, so only new or changed element sets are propagated. Entries are
+   held in a bounded in-memory LRU and, optionally, written through to a
+   bounded on-disk LRU that persists across processes.
+"""
+
+import os
+import glob
+import hashlib
+import collections
+import numpy
+
+def getGridDigest(t_s, frame='eci', dtype=float):
+    """Returns a digest (bytes) identifying the given time grid (seconds since
+       J2000), output frame, and output precision.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(numpy.ascontiguousarray(t_s, dtype='<f8').tobytes())
+    h.update(frame.encode())
+    h.update(numpy.dtype(dtype).str.encode())
+    return h.digest()
+
+def getKeys(pop, t_s, frame='eci', dtype=float):
+    """Returns a list of hexadecimal keys, one per object of the given
+       Population, hashing its elements, epoch, and model (two-body or mean J2)
+       along with the time grid, frame, and precision. Keys are stable across
+       processes and change if any of these inputs change.
+    """
+    rows = numpy.empty((len(pop), 7), dtype='<f8')
+    for col, attr in enumerate(('a_m', 'e', 'i_rad', 'O_rad', 'w_rad', 'M_rad', 'tEpoch_s')):
+        rows[:,col] = getattr(pop, attr)
+    rows = rows.tobytes()
+    models = pop.isJ2.astype('u1').tobytes()
+    grid = getGridDigest(t_s, frame, dtype)
+    keys = []
+    for ndx in range(len(pop)):
+        h = hashlib.blake2b(grid, digest_size=16)
+        h.update(rows[56*ndx:56*(ndx+1)])
+        h.update(models[ndx:ndx+1])
+        keys.append(h.hexdigest())
+    return keys
+
+class Cache(object):
+    """Bounded memory (and, optionally, disk) LRU store of per-object ephemerides
+    """
+
+    def __init__(self, maxBytes=2**28, path=None, maxDiskBytes=2**32):
+        """Initializes a cache holding at most *maxBytes* of ephemerides in
+           memory. If a directory is given, every new entry is also written
+           there (as one .npy file per key) and existing entries are reused,
+           with at most *maxDiskBytes* kept on disk.
+        """
+        self.maxBytes = maxBytes
+        self.path = path
+        self.maxDiskBytes = maxDiskBytes
+        self.memory = collections.OrderedDict()
+        self.disk = collections.OrderedDict()
+        self.nBytes = 0
+        self.nDiskBytes = 0
+        self.nHits = 0
+        self.nDiskHits = 0
+        self.nMisses = 0
+        self.nEvictions = 0
+        self.nDiskEvictions = 0
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            files = sorted(glob.glob(os.path.join(path, '*.npy')), key=os.path.getmtime)
+            for f in files:
+                key = os.path.basename(f)[:-4]
+                self.disk[key] = os.path.getsize(f)
+                self.nDiskBytes += self.disk[key]
+            self.evict()
+
+    def __len__(self):
+        """Returns the number of entries held in memory.
+        """
+        return len(self.memory)
+
+    def getFile(self, key):
+        """Returns the path of the on-disk file for the given key.
+        """
+        return os.path.join(self.path, key + '.npy')
+
+    def evict(self):
+        """Removes least-recently-used entries until memory and disk usage are
+           within their bounds.
+        """
+        while self.nBytes > self.maxBytes and len(self.memory) > 0:
+            _, value = self.memory.popitem(last=False)
+            self.nBytes -= value.nbytes
+            self.nEvictions += 1
+        while self.nDiskBytes > self.maxDiskBytes and len(self.disk) > 0:
+            key, size = self.disk.popitem(last=False)
+            self.nDiskBytes -= size
+            self.nDiskEvictions += 1
+            try:
+                os.remove(self.getFile(key))
+            except OSError:
+                pass
+
+    def get(self, key):
+        """Returns the cached ephemeris for the given key (reading it from disk
+           if necessary), or None; updates recency and hit/miss counts.
+        """
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.nHits += 1
+            return self.memory[key]
+        if key in self.disk:
+            try:
+                value = numpy.load(self.getFile(key))
+            except (OSError, ValueError):
+                self.nDiskBytes -= self.disk.pop(key)
+            else:
+                self.disk.move_to_end(key)
+                os.utime(self.getFile(key))
+                self.nHits += 1
+                self.nDiskHits += 1
+                self.put(key, value, isWrite=False)
+                return value
+        self.nMisses += 1
+        return None
+
+    def put(self, key, value, isWrite=True):
+        """Stores the given ephemeris array under the given key, writing it
+           through to disk (if the cache has a path and *isWrite* is set), and
+           evicts entries as needed.
+        """
+        if key in self.memory:
+            self.nBytes -= self.memory.pop(key).nbytes
+        self.memory[key] = value
+        self.nBytes += value.nbytes
+        if isWrite and self.path is not None and key not in self.disk:
+            numpy.save(self.getFile(key), value)
+            self.disk[key] = os.path.getsize(self.getFile(key))
+            self.nDiskBytes += self.disk[key]
+        self.evict()
+
+    def propagate(self, pop, t_s, frame='eci', dtype=float):
+        """Returns the (N,T,3) positions of every object of the given Population
+           over the given time grid (seconds since J2000) in the given frame and
+           precision (see *Population.getPosition*), reusing cached ephemerides
+           and propagating all remaining objects in one batch.
+        """
+        t_s = numpy.asarray(t_s, dtype=float)
+        keys = getKeys(pop, t_s, frame, dtype)
+        out = numpy.empty((len(pop), t_s.shape[0], 3), dtype=dtype)
+        missing = []
+        for ndx, key in enumerate(keys):
+            value = self.get(key)
+            if value is None:
+                missing.append(ndx)
+            else:
+                out[ndx] = value
+        if len(missing) > 0:
+            out[missing] = pop.subset(missing).getPosition(t_s, frame, dtype)
+            for ndx in missing:
+                self.put(keys[ndx], out[ndx].copy())
+        return out
+
+    def getStats(self):
+        """Returns a dictionary of hit, miss, and eviction counts, the hit rate,
+           and current memory and disk usage (in bytes).
+        """
+        nLookups = self.nHits + self.nMisses
+        return {
+            'hits': self.nHits,
+            'diskHits': self.nDiskHits,
+            'misses': self.nMisses,
+            'hitRate': self.nHits / nLookups if nLookups > 0 else 0,
+            'evictions': self.nEvictions,
+            'diskEvictions': self.nDiskEvictions,
+            'entries': len(self.memory),
+            'bytes': self.nBytes,
+            'diskEntries': len(self.disk),
+            'diskBytes': self.nDiskBytes,
+        }
@@ -0,0 +1,136 @@
+"""Defines the command-line interface of the package (invoked with *python -m
+   oyb*). The *propagate* command streams a catalog's ephemerides to disk in
+   chunks of objects, optionally across several worker processes:
+
+       python -m oyb propagate catalog.tle --start 2016-11-08T00:00:00 \\
+           --span 86400 --step 60 --frame lla --model MeanJ2 -o out.npy
+
+   With *--dtype float32*, positions are formed and written in single
+   precision (see *batch.Population.getRVeci* for the error bounds).
+"""
+
+import sys
+import time
+import argparse
+import collections
+import concurrent.futures
+import numpy
+from oyb import batch, earth, ephem
+
+models = ('Orbit', 'MeanJ2')
+dtypes = ('float64', 'float32')
+
+def propagateChunk(pop, t_s, frame, dtype=float):
+    """Propagates one chunk of a population over the given times (seconds since
+       J2000) in the given frame and precision. Defined at module level for
+       worker processes.
+    """
+    return pop.getPosition(t_s, frame, dtype)
+
+def getChunks(pop, nChunk):
+    """Yields successive sub-populations of (at most) *nChunk* objects.
+    """
+    for n0 in range(0, len(pop), nChunk):
+        yield pop.subset(slice(n0, n0 + nChunk))
+
+def propagate(pop, t_s, writer, frame='eci', nChunk=64, nWorkers=1, progress=None):
+    """Propagates a population over the given times and streams the results,
+       chunk by chunk and in object order, to the given ephemeris writer (in
+       the writer's precision). With more than one worker, chunks are computed
+       in a process pool (with at most two chunks in flight per worker, to
+       bound memory). If given, *progress* is called with the number of
+       objects written so far.
+    """
+    chunks = getChunks(pop, nChunk)
+    if nWorkers > 1:
+        with concurrent.futures.ProcessPoolExecutor(nWorkers) as executor:
+            futures = collections.deque()
+            for c in chunks:
+                futures.append(executor.submit(propagateChunk, c, t_s, frame, writer.dtype))
+                if len(futures) >= 2 * nWorkers:
+                    writer.write(futures.popleft().result())
+                    if progress is not None:
+                        progress(writer.nWritten)
+            while len(futures) > 0:
+                writer.write(futures.popleft().result())
+                if progress is not None:
+                    progress(writer.nWritten)
+    else:
+        for c in chunks:
+            writer.write(propagateChunk(c, t_s, frame, writer.dtype))
+            if progress is not None:
+                progress(writer.nWritten)
+
+def getProgress(nTotal, stream=sys.stderr):
+    """Returns a progress callback that reports objects written, percentage,
+       and elapsed time on a single (rewritten) line of the given stream.
+    """
+    tStart = time.perf_counter()
+    def progress(n):
+        stream.write('\r%u/%u objects (%.1f%%) in %.1f s' % (n, nTotal, 100 * n / nTotal, time.perf_counter() - tStart))
+        if n >= nTotal:
+            stream.write('\n')
+        stream.flush()
+    return progress
+
+def runPropagate(args):
+    """Executes the *propagate* command for the parsed arguments.
+    """
+    with open(args.catalog, 'r') as f:
+        pop = batch.Population.fromTle(f.read(), isJ2=args.model == 'MeanJ2')
+    if args.start is None:
+        tStart_s = float(numpy.min(pop.tEpoch_s))
+    else:
+        tStart_s = earth.dt2sec(args.start)
+    t_s = tStart_s + numpy.arange(0, args.span + 0.5 * args.step, args.step)
+    progress = None if args.quiet else getProgress(len(pop))
+    with ephem.getWriter(args.output, pop.names, t_s, args.frame, args.format, args.dtype) as writer:
+        propagate(pop, t_s, writer, args.frame, args.chunk, args.workers, progress)
+
+def getParser():
+    """Returns the argument parser for all commands.
+    """
+    parser = argparse.ArgumentParser(prog='python -m oyb', description='Oy vey! So many orbit models.')
+    commands = parser.add_subparsers(dest='command')
+    p = commands.add_parser('propagate', help='propagate a TLE catalog over a time span')
+    p.add_argument('catalog', help='path to TLE catalog (with or without title lines)')
+    p.add_argument('-o', '--output', required=True, help='output path (.csv, .npy, or .bin)')
+    p.add_argument('--start', default=None, help='ISO 8601 start time (defaults to earliest epoch)')
+    p.add_argument('--span', type=float, default=86400.0, help='time span, in seconds')
+    p.add_argument('--step', type=float, default=60.0, help='time step, in seconds')
+    p.add_argument('--frame', choices=ephem.frames, default='eci')
+    p.add_argument('--model', choices=models, default='Orbit')
+    p.add_argument('--format', choices=sorted(ephem.writers), default=None, help='output format (defaults to output extension)')
+    p.add_argument('--dtype', choices=dtypes, default='float64', help='output precision (float32 halves memory and disk use)')
+    p.add_argument('--chunk', type=int, default=64, help='objects per chunk')
+    p.add_argument('--workers', type=int, default=1, help='worker processes')
+    p.add_argument('--quiet', action='store_true', help='suppress progress reporting')
+    p.set_defaults(run=runPropagate, check=checkPropagate)
+    return parser
+
+def checkPropagate(parser, args):
+    """Validates (and converts) the parsed arguments of the *propagate*
+       command, exiting with a usage error for invalid values.
+    """
+    for name in ('step', 'chunk', 'workers'):
+        if not getattr(args, name) > 0:
+            parser.error('--%s must be positive' % name)
+    if not args.span >= 0:
+        parser.error('--span must not be negative')
+    if args.start is not None:
+        try:
+            args.start = earth.parseTime(args.start)
+        except ValueError:
+            parser.error('--start must be an ISO 8601 time (got "%s")' % args.start)
+
+def main(argv=None):
+    """Parses the given (or system) arguments and runs the selected command.
+    """
+    parser = getParser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 1
+    args.check(parser, args)
+    args.run(args)
+    return 0
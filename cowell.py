@@ -0,0 +1,181 @@
+"""Defines a numerical (Cowell) propagator that integrates the ECI states of
+   many objects at once under central-body gravity plus (optionally) the J2
+   harmonic. All states are stepped together as one (N,6) array by an adaptive
+   Dormand-Prince RK5(4) scheme, and its dense (continuous) output is used to
+   evaluate requested times without shortening steps.
+"""
+
+import numpy
+import oyb
+from oyb import batch, earth
+
+# Dormand-Prince RK5(4)7M coefficients, with Shampine's dense output matrix
+C = numpy.array([0, 1/5, 3/10, 4/5, 8/9, 1])
+A = [
+    numpy.array([]),
+    numpy.array([1/5]),
+    numpy.array([3/40, 9/40]),
+    numpy.array([44/45, -56/15, 32/9]),
+    numpy.array([19372/6561, -25360/2187, 64448/6561, -212/729]),
+    numpy.array([9017/3168, -355/33, 46732/5247, 49/176, -5103/18656])]
+B = numpy.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84])
+E = numpy.array([-71/57600, 0, 71/16695, -71/1920, 17253/339200, -22/525, 1/40])
+P = numpy.array([
+    [1, -8048581381/2820520608, 8663915743/2820520608, -12715105075/11282082432],
+    [0, 0, 0, 0],
+    [0, 131558114200/32700410799, -68118460800/10900136933, 87487479700/32700410799],
+    [0, -1754552775/470086768, 14199869525/1410260304, -10690763975/1880347072],
+    [0, 127303824393/49829197408, -318862633887/49829197408, 701980252875/199316789632],
+    [0, -282668133/205662961, 2019193451/616988883, -1453857185/822651844],
+    [0, 40617522/29380423, -110615467/29380423, 69997945/29380423]])
+
+def getAccel(rEci_m, isJ2=True):
+    """Returns the gravitational acceleration (meters per second squared) at
+       each of the given (N,3) ECI positions, from a point-mass earth plus,
+       if *isJ2* is set, the J2 harmonic.
+    """
+    r2_m2 = numpy.sum(rEci_m**2, axis=1, keepdims=True)
+    aEci_mps2 = -earth.mu_m3ps2 * rEci_m / r2_m2**1.5
+    if isJ2:
+        k = 1.5 * earth.j2 * earth.eqRad_m**2 / r2_m2
+        z2r2 = 5 * rEci_m[:,2:3]**2 / r2_m2
+        aEci_mps2 = aEci_mps2 * (1 - k * (z2r2 - numpy.array([1, 1, 3])))
+    return aEci_mps2
+
+class Cowell(object):
+    """Numerical propagation of many ECI states, stepped together
+    """
+
+    def __init__(self, rEci_m, vEci_mps, tEpoch_s, isJ2=True, rtol=1e-10, atol_m=1e-4, names=None):
+        """Initializes the propagator from (N,3) ECI position (meters) and
+           velocity (meters per second) arrays at a common epoch (seconds since
+           J2000). Steps are sized so that the estimated local error of every
+           state component stays within *rtol* of its magnitude plus an
+           absolute tolerance (*atol_m* for position; one thousandth of that,
+           per second, for velocity).
+        """
+        self.y = numpy.hstack((numpy.atleast_2d(rEci_m), numpy.atleast_2d(vEci_mps))).astype(float)
+        self.t_s = float(tEpoch_s)
+        self.isJ2 = isJ2
+        self.rtol = rtol
+        self.atol = atol_m * numpy.array([1, 1, 1, 1e-3, 1e-3, 1e-3])
+        self.names = list(names) if names is not None else [str(ndx) for ndx in range(self.y.shape[0])]
+        self.h_s = None
+        self.nSteps = 0
+        self.nRejected = 0
+
+    def __len__(self):
+        """Returns the number of objects being propagated.
+        """
+        return self.y.shape[0]
+
+    def getDerivative(self, y):
+        """Returns the time derivative of the given (N,6) state array.
+        """
+        return numpy.hstack((y[:,3:], getAccel(y[:,:3], self.isJ2)))
+
+    def step(self, h_s, f0):
+        """Attempts one Dormand-Prince step of the given size from the current
+           state (with derivative *f0*), returning the new state, the (7,N,6)
+           stage derivatives, and the normalized error (the worst object).
+        """
+        K = numpy.empty((7,) + self.y.shape)
+        K[0] = f0
+        for s in range(1, 6):
+            K[s] = self.getDerivative(self.y + h_s * numpy.tensordot(A[s], K[:s], axes=1))
+        y = self.y + h_s * numpy.tensordot(B, K[:6], axes=1)
+        K[6] = self.getDerivative(y)
+        scale = self.atol + self.rtol * numpy.maximum(numpy.abs(self.y), numpy.abs(y))
+        err = h_s * numpy.tensordot(E, K, axes=1) / scale
+        return y, K, numpy.max(numpy.sum(err**2, axis=1) / 6)**0.5
+
+    def getInitialStep(self):
+        """Returns an initial step size (seconds) of 1/200th of the shortest
+           instantaneous (two-body) orbital period.
+        """
+        r_m = numpy.sum(self.y[:,:3]**2, axis=1)**0.5
+        v2_m2ps2 = numpy.sum(self.y[:,3:]**2, axis=1)
+        a_m = 1 / (2 / r_m - v2_m2ps2 / earth.mu_m3ps2)
+        T_s = 2 * numpy.pi * (numpy.abs(a_m)**3 / earth.mu_m3ps2)**0.5
+        return numpy.min(T_s) / 200
+
+    def propagate(self, t_s):
+        """Integrates forward through the given sorted times (seconds since
+           J2000, at or after the current time), returning (N,T,3) position and
+           velocity arrays evaluated at each one from the dense output. The
+           propagator is left at the final time, so subsequent calls continue
+           from there.
+        """
+        t_s = numpy.atleast_1d(numpy.asarray(t_s, dtype=float))
+        if numpy.any(numpy.diff(t_s) < 0) or (t_s.shape[0] > 0 and t_s[0] < self.t_s):
+            raise ValueError('Output times must be sorted and no earlier than the current time')
+        out = numpy.empty((self.y.shape[0], t_s.shape[0], 6))
+        k = 0
+        while k < t_s.shape[0] and t_s[k] <= self.t_s:
+            out[:,k,:] = self.y
+            k += 1
+        if self.h_s is None:
+            self.h_s = self.getInitialStep()
+        f0 = self.getDerivative(self.y)
+        while k < t_s.shape[0]:
+            h_s = min(self.h_s, t_s[-1] - self.t_s)
+            y, K, err = self.step(h_s, f0)
+            factor = 0.9 * err**-0.2 if err > 0 else 5
+            if err > 1:
+                self.nRejected += 1
+                self.h_s = h_s * max(0.2, factor)
+                continue
+            self.nSteps += 1
+            tNew_s = self.t_s + h_s
+            kEnd = k + numpy.searchsorted(t_s[k:], tNew_s, side='right')
+            if kEnd > k:
+                sigma = (t_s[k:kEnd] - self.t_s) / h_s
+                powers = numpy.cumprod(numpy.repeat(sigma[:,numpy.newaxis], 4, axis=1), axis=1)
+                Q = numpy.tensordot(P, K, axes=(0, 0))
+                out[:,k:kEnd,:] = self.y[:,numpy.newaxis,:] + h_s * numpy.einsum('jnc,tj->ntc', Q, powers)
+                k = kEnd
+            self.y, self.t_s, f0 = y, tNew_s, K[6]
+            if h_s == self.h_s or factor < 1:
+                self.h_s = h_s * min(5, max(0.2, factor))
+        return out[...,:3], out[...,3:]
+
+    def applyDeltaV(self, dvEci_mps):
+        """Applies an impulsive maneuver at the current time, adding the given
+           ECI velocity change ((N,3), or (3,) for every object) to each state.
+        """
+        self.y[:,3:] += dvEci_mps
+
+    def getRVeci(self):
+        """Returns the current (N,3) ECI position and velocity arrays.
+        """
+        return self.y[:,:3].copy(), self.y[:,3:].copy()
+
+    def toOrbits(self):
+        """Returns a list of (osculating) Orbit objects for the current states,
+           with their epoch set to the current time.
+        """
+        orbits = []
+        for ndx in range(self.y.shape[0]):
+            o = oyb.Orbit.fromRV(self.y[ndx,:3], self.y[ndx,3:])
+            o.tEpoch_dt = earth.sec2dt(self.t_s)
+            orbits.append(o)
+        return orbits
+
+    @classmethod
+    def fromPopulation(cls, pop, tEpoch_s, **kwargs):
+        """Constructs a propagator seeded by the states of the given Population
+           at the given time (seconds since J2000).
+        """
+        rEci_m, vEci_mps = pop.getRVeci(tEpoch_s)
+        return cls(rEci_m, vEci_mps, tEpoch_s, names=pop.names, **kwargs)
+
+    @classmethod
+    def fromOrbits(cls, orbits, tEpoch_s=None, **kwargs):
+        """Constructs a propagator seeded by the states of the given Orbit
+           objects at the given time (seconds since J2000), which defaults to
+           the epoch of the first orbit.
+        """
+        pop = batch.Population.fromOrbits(orbits)
+        if tEpoch_s is None:
+            tEpoch_s = pop.tEpoch_s[0]
+        return cls.fromPopulation(pop, tEpoch_s, **kwargs)
@@ -1,5 +1,6 @@
 """Defines earth parameters and key earth-specific calculations (ECF/ENU frame
-   conversions, latitude/longitude, GMST, etc.).
+   conversions, geodetic latitude/longitude, look angles, GMST, solar position,
+   etc.).
 """
 
 from __future__ import division
@@ -17,11 +18,46 @@ flatness = 0.003353
 j2 = 1.08263e-3
 tSidYear_s = 365.25636 * 86400
 
+# Solar parameters
+au_m = 1.495978707e11
+sunRad_m = 6.96e8
+
+def dt2sec(t_dt):
+    """Returns the number of seconds between the J2000 epoch and the given
+       *datetime.datetime* value. Batch (array) computations in this package
+       represent time in this form.
+    """
+    return (t_dt - j2000_dt).total_seconds()
+
+def parseTime(text):
+    """Parses an ISO 8601 time into a naive UTC *datetime.datetime* value (the
+       form expected by *dt2sec*); times with an offset (or a "Z" suffix) are
+       converted to UTC. Raises a ValueError for malformed times.
+    """
+    if text.endswith(('Z', 'z')):
+        text = text[:-1] + '+00:00'
+    t_dt = datetime.datetime.fromisoformat(text)
+    if t_dt.tzinfo is not None:
+        t_dt = t_dt.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return t_dt
+
+def sec2dt(t_s):
+    """Returns the *datetime.datetime* value the given number of seconds after
+       the J2000 epoch (the inverse of *dt2sec*).
+    """
+    return j2000_dt + datetime.timedelta(seconds=float(t_s))
+
 def getGmst(t_dt):
     """Returns GMST--the angle (in radians) between the first point of Aries
        and 0-longitude--at the given *datetime.datetime* value.
     """
-    dt_days = (t_dt - j2000_dt).total_seconds() / 86400
+    return getGmstSec(dt2sec(t_dt))
+
+def getGmstSec(t_s):
+    """Returns GMST (in radians) at the given time, expressed in seconds since
+       the J2000 epoch. Accepts a scalar or any numpy array of times.
+    """
+    dt_days = t_s / 86400
     gmst_hrs = 18.697374558 + 24.06570982441908 * dt_days
     return 2 * pi * (gmst_hrs % 24) / 24
 
@@ -43,6 +79,50 @@ def getQeci2ecf(t_dt):
     """
     return rot.Z(getGmst(t_dt))
 
+def eci2ecf(rEci_m, t_s):
+    """Rotates an array of ECI vectors (trailing axis of three components) into
+       the ECF frame at the corresponding times (seconds since J2000, with the
+       shape of the leading axes or broadcast-compatible with it). The angles
+       are computed in float64; float32 vectors are rotated in float32.
+    """
+    gmst_rad = getGmstSec(numpy.asarray(t_s, dtype=float))
+    dtype = numpy.result_type(rEci_m.dtype, numpy.float32)
+    c, s = numpy.cos(gmst_rad).astype(dtype), numpy.sin(gmst_rad).astype(dtype)
+    x, y = rEci_m[...,0], rEci_m[...,1]
+    return numpy.stack(numpy.broadcast_arrays(c * x + s * y, c * y - s * x, rEci_m[...,2]), axis=-1)
+
+def lla2ecf(rLla_radm):
+    """Converts an array of geodetic latitude, longitude, and altitude values
+       (trailing axis of three components; radians, radians, and meters) into
+       ECF positions (meters) on the same oblate spheroid as *lla2eci*.
+    """
+    lat_rad, lon_rad, alt_m = rLla_radm[...,0], rLla_radm[...,1], rLla_radm[...,2]
+    d = (1 - (2 * flatness - flatness**2) * numpy.sin(lat_rad)**2)**0.5
+    x = (eqRad_m / d + alt_m) * numpy.cos(lat_rad) * numpy.cos(lon_rad)
+    y = (eqRad_m / d + alt_m) * numpy.cos(lat_rad) * numpy.sin(lon_rad)
+    z = (eqRad_m * (1 - flatness)**2 / d + alt_m) * numpy.sin(lat_rad)
+    return numpy.stack((x, y, z), axis=-1)
+
+def ecf2lla(rEcf_m, nIter=2):
+    """Converts an array of ECF positions (trailing axis of three components,
+       meters) into geodetic latitude, longitude, and altitude (radians,
+       radians, and meters) above the oblate spheroid. Latitude is found by
+       Bowring's iteration on the parametric latitude, which converges to well
+       under a millimeter within two iterations for any terrestrial or orbital
+       position.
+    """
+    e2 = 2 * flatness - flatness**2
+    b_m = eqRad_m * (1 - flatness)
+    x, y, z = rEcf_m[...,0], rEcf_m[...,1], rEcf_m[...,2]
+    p_m = (x**2 + y**2)**0.5
+    beta_rad = numpy.arctan2(z, (1 - flatness) * p_m)
+    for _ in range(nIter):
+        lat_rad = numpy.arctan2(z + e2 / (1 - e2) * b_m * numpy.sin(beta_rad)**3, p_m - e2 * eqRad_m * numpy.cos(beta_rad)**3)
+        beta_rad = numpy.arctan2((1 - flatness) * numpy.sin(lat_rad), numpy.cos(lat_rad))
+    sLat, cLat = numpy.sin(lat_rad), numpy.cos(lat_rad)
+    alt_m = p_m * cLat + z * sLat - eqRad_m * (1 - e2 * sLat**2)**0.5
+    return numpy.stack((lat_rad, numpy.arctan2(y, x), alt_m), axis=-1)
+
 def getQecf2enu(rSiteLla_radm):
     """Returns a transformation matrix that converts an ECF vector to ENZ as
        perceived from a site at the given lat/lon/alt location. Note that this
@@ -53,6 +133,64 @@ def getQecf2enu(rSiteLla_radm):
     rz = rot.Z(rSiteLla_radm[1])
     return Quen2enu.dot(ry).dot(rz)
 
+def getQecf2enuArray(rSiteLla_radm):
+    """Returns an (M,3,3) stack of the *getQecf2enu* transformations for an
+       (M,3) array of site lat/lon/alt locations.
+    """
+    rSiteLla_radm = numpy.atleast_2d(rSiteLla_radm)
+    sLat, cLat = numpy.sin(rSiteLla_radm[:,0]), numpy.cos(rSiteLla_radm[:,0])
+    sLon, cLon = numpy.sin(rSiteLla_radm[:,1]), numpy.cos(rSiteLla_radm[:,1])
+    zero = numpy.zeros(sLat.shape)
+    return numpy.stack((
+        numpy.stack((-sLon, cLon, zero), axis=-1),
+        numpy.stack((-sLat * cLon, -sLat * sLon, cLat), axis=-1),
+        numpy.stack((cLat * cLon, cLat * sLon, sLat), axis=-1)), axis=1)
+
+def ecf2enu(rEcf_m, rSiteLla_radm):
+    """Returns the east/north/up components (meters) of the given ECF positions
+       (trailing axis of three components, any leading shape S) relative to
+       each of the given (M,3) geodetic sites, as an (M,)+S+(3,) array, with
+       all sites rotated in one broadcast matrix product.
+    """
+    rSiteLla_radm = numpy.atleast_2d(rSiteLla_radm)
+    rSiteEcf_m = lla2ecf(rSiteLla_radm)
+    Q = getQecf2enuArray(rSiteLla_radm)
+    rEcf_m = numpy.asarray(rEcf_m, dtype=float)
+    rEnu_m = numpy.matmul(rEcf_m.reshape(1, -1, 3), Q.transpose(0, 2, 1)) - numpy.einsum('mij,mj->mi', Q, rSiteEcf_m)[:,numpy.newaxis,:]
+    return rEnu_m.reshape((Q.shape[0],) + rEcf_m.shape)
+
+def ecf2aer(rEcf_m, rSiteLla_radm):
+    """Returns look-angle tables of the given ECF positions (trailing axis of
+       three components, any leading shape S) as seen from each of the given
+       (M,3) geodetic sites: an (M,)+S+(3,) array (e.g., (M,N,T,3) for N
+       satellites at T times) of azimuth (radians, clockwise from north in
+       [0,2pi)), elevation (radians), and range (meters).
+    """
+    rEnu_m = ecf2enu(rEcf_m, rSiteLla_radm)
+    e, n, u = rEnu_m[...,0], rEnu_m[...,1], rEnu_m[...,2]
+    range_m = (e**2 + n**2 + u**2)**0.5
+    az_rad = numpy.arctan2(e, n) % (2 * pi)
+    el_rad = numpy.arcsin(numpy.clip(u / range_m, -1, 1))
+    return numpy.stack((az_rad, el_rad, range_m), axis=-1)
+
+def getSunEci(t_s):
+    """Returns the (apparent) position of the sun w.r.t. the earth, in meters
+       and evaluated within the ECI frame, at the given time(s) (seconds since
+       J2000). Uses the low-precision almanac series (after Curtis, Algorithm
+       12.2), good to roughly 0.01 degrees; a trailing axis of three components
+       is appended to the shape of the times.
+    """
+    n_days = numpy.asarray(t_s, dtype=float) / 86400
+    M_rad = (357.528 + 0.9856003 * n_days) % 360 * pi / 180
+    L_deg = (280.460 + 0.98564736 * n_days) % 360
+    lam_rad = (L_deg + 1.915 * numpy.sin(M_rad) + 0.020 * numpy.sin(2 * M_rad)) * pi / 180
+    eps_rad = (23.439 - 3.56e-7 * n_days) * pi / 180
+    r_m = au_m * (1.00014 - 0.01671 * numpy.cos(M_rad) - 0.000140 * numpy.cos(2 * M_rad))
+    x = r_m * numpy.cos(lam_rad)
+    y = r_m * numpy.sin(lam_rad) * numpy.cos(eps_rad)
+    z = r_m * numpy.sin(lam_rad) * numpy.sin(eps_rad)
+    return numpy.stack((x, y, z), axis=-1)
+
 def getRotVel():
     """Returns the rotational velocity of the earth, in radians per second.
     """
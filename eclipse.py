@@ -0,0 +1,106 @@
+"""Defines vectorized earth-shadow (eclipse) computations for propagated
+   positions, using the low-fidelity solar ephemeris in *earth*. Shadow states
+   are 0 (sunlit), 1 (penumbra), or 2 (umbra); the cylindrical model only
+   distinguishes sunlit and umbra.
+"""
+
+import numpy
+from oyb import earth
+
+sunlit = 0
+penumbra = 1
+umbra = 2
+models = ('cylindrical', 'conical')
+
+def _norm(v):
+    """Returns the magnitude along the trailing axis of an array of vectors.
+    """
+    return numpy.sum(v**2, axis=-1)**0.5
+
+def getMargins(rEci_m, rSun_m, model='conical'):
+    """Returns a tuple of penumbral and umbral margins for each ECI position
+       (meters) given the broadcast-compatible ECI position of the sun. Margins
+       are continuous, signed quantities that are negative inside the shadow
+       region: conical margins are angles (radians) between the apparent solar
+       and earth discs, while cylindrical margins are distances (meters) from
+       the shadow cylinder (and so both margins are identical).
+    """
+    r_m = _norm(rEci_m)
+    if model == 'cylindrical':
+        uSun = rSun_m / _norm(rSun_m)[...,numpy.newaxis]
+        along_m = numpy.sum(rEci_m * uSun, axis=-1)
+        perp_m = _norm(rEci_m - along_m[...,numpy.newaxis] * uSun)
+        margin = numpy.where(along_m < 0, perp_m, r_m) - earth.eqRad_m
+        return margin, margin
+    if model == 'conical':
+        rRel_m = rSun_m - rEci_m
+        rRelMag_m = _norm(rRel_m)
+        a_rad = numpy.arcsin(numpy.clip(earth.sunRad_m / rRelMag_m, -1, 1))
+        b_rad = numpy.arcsin(numpy.clip(earth.eqRad_m / r_m, -1, 1))
+        c_rad = numpy.arccos(numpy.clip(-numpy.sum(rEci_m * rRel_m, axis=-1) / (r_m * rRelMag_m), -1, 1))
+        return c_rad - (a_rad + b_rad), c_rad - (b_rad - a_rad)
+    raise ValueError('Unsupported shadow model "%s"' % model)
+
+def getShadow(rEci_m, rSun_m, model='conical'):
+    """Returns an int8 array of shadow states (0 sunlit, 1 penumbra, 2 umbra)
+       for each ECI position, given the broadcast-compatible ECI position of
+       the sun.
+    """
+    pen, umb = getMargins(rEci_m, rSun_m, model)
+    flags = numpy.zeros(pen.shape, dtype=numpy.int8)
+    flags[pen < 0] = penumbra
+    flags[umb < 0] = umbra
+    return flags
+
+def getStates(pop, t_s, model='conical'):
+    """Returns an (N,T) int8 array of shadow states for each member of the
+       given Population at each time (seconds since J2000) of a shared grid.
+    """
+    t_s = numpy.asarray(t_s, dtype=float)
+    return getShadow(pop.getReci(t_s), earth.getSunEci(t_s)[numpy.newaxis,...], model)
+
+def getEclipses(pop, t_s, model='conical', region=penumbra, nChunk=1440):
+    """Finds all eclipse intervals of each member of the given Population over
+       a shared time grid (seconds since J2000), returning a tuple of object
+       indices, entry times, and exit times (sorted by object, then time).
+       With *region* 1 (penumbra) intervals cover any shadow; with 2 (umbra)
+       only full shadow. Entry and exit times are interpolated between samples
+       from the shadow margins; intervals in progress at either end of the grid
+       are clipped to it. The grid is evaluated *nChunk* samples at a time to
+       bound memory over long spans.
+    """
+    if region not in (penumbra, umbra):
+        raise ValueError('Eclipse region must be penumbra (1) or umbra (2)')
+    t_s = numpy.asarray(t_s, dtype=float)
+    objs, times, entries = [], [], []
+    mPrev, tPrev = None, None
+    for k0 in range(0, t_s.shape[0], nChunk):
+        tc_s = t_s[k0:k0 + nChunk]
+        rSun_m = earth.getSunEci(tc_s)[numpy.newaxis,...]
+        m = getMargins(pop.getReci(tc_s), rSun_m, model)[region - 1]
+        if mPrev is None:
+            ndx = numpy.nonzero(m[:,0] < 0)[0]
+            objs.append(ndx)
+            times.append(numpy.full(ndx.shape, tc_s[0]))
+            entries.append(numpy.ones(ndx.shape, dtype=bool))
+        else:
+            m = numpy.concatenate((mPrev[:,numpy.newaxis], m), axis=1)
+            tc_s = numpy.concatenate(([tPrev], tc_s))
+        inside = m < 0
+        ndx, k = numpy.nonzero(inside[:,1:] != inside[:,:-1])
+        f = m[ndx,k] / (m[ndx,k] - m[ndx,k+1])
+        objs.append(ndx)
+        times.append(tc_s[k] + f * (tc_s[k+1] - tc_s[k]))
+        entries.append(inside[ndx,k+1])
+        mPrev, tPrev = m[:,-1], tc_s[-1]
+    if mPrev is not None:
+        ndx = numpy.nonzero(mPrev < 0)[0]
+        objs.append(ndx)
+        times.append(numpy.full(ndx.shape, tPrev))
+        entries.append(numpy.zeros(ndx.shape, dtype=bool))
+    objs = numpy.concatenate(objs) if len(objs) > 0 else numpy.zeros(0, dtype=int)
+    times = numpy.concatenate(times) if len(times) > 0 else numpy.zeros(0)
+    entries = numpy.concatenate(entries) if len(entries) > 0 else numpy.zeros(0, dtype=bool)
+    order = numpy.lexsort((~entries, times, objs))
+    objs, times, entries = objs[order], times[order], entries[order]
+    return objs[entries], times[entries], times[~entries]
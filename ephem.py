@@ -0,0 +1,159 @@
+"""Defines streaming writers (and readers) for propagated ephemerides, so that
+   results for large catalogs can be written in chunks of objects without
+   holding the full (objects x times x 3) array in memory. Supported formats
+   are CSV, NPY, and a simple binary ephemeris format (see *BinWriter*).
+"""
+
+import os
+import struct
+import numpy
+from numpy.lib import format as npformat
+from oyb import earth
+
+magics = {b'OYBEPH01': '<f8', b'OYBEPHF4': '<f4'}
+frames = ('eci', 'ecf', 'lla')
+headerFormat = '<8sIIdd4s'
+nameLength = 24
+
+class Writer(object):
+    """Base class for chunked ephemeris writers
+    """
+
+    def __init__(self, path, names, t_s, frame='eci', dtype=float):
+        """Opens the given path for an ephemeris of the named objects sampled
+           at the given times (seconds since J2000) in the given frame, with
+           positions stored as the given floating-point type (float64 or
+           float32).
+        """
+        self.path = path
+        self.names = list(names)
+        self.t_s = numpy.asarray(t_s, dtype=float)
+        self.frame = frame
+        self.dtype = numpy.dtype(dtype)
+        if self.dtype not in (numpy.float64, numpy.float32):
+            raise ValueError('Unsupported ephemeris precision "%s"' % self.dtype)
+        self.nWritten = 0
+
+    def write(self, r):
+        """Appends an (K,T,3) chunk of positions for the next K objects.
+        """
+        self.writeChunk(r)
+        self.nWritten += r.shape[0]
+
+    def writeChunk(self, r):
+        """Writes a chunk of positions; implemented by each format.
+        """
+        raise NotImplementedError()
+
+    def close(self):
+        """Finalizes the output file.
+        """
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+class CsvWriter(Writer):
+    """Writes one row per object and time: name, ISO time, and components
+    """
+
+    def __init__(self, path, names, t_s, frame='eci', dtype=float):
+        """Opens the CSV file and writes its column header. Components are
+           written with enough digits to round-trip the given precision.
+        """
+        super(CsvWriter, self).__init__(path, names, t_s, frame, dtype)
+        self.pattern = '%s,%s,%.17g,%.17g,%.17g\n' if self.dtype == numpy.float64 else '%s,%s,%.9g,%.9g,%.9g\n'
+        self.times = [earth.sec2dt(t).isoformat() for t in self.t_s]
+        columns = ('lat_rad', 'lon_rad', 'alt_m') if frame == 'lla' else ('x_m', 'y_m', 'z_m')
+        self.f = open(path, 'w')
+        self.f.write('name,time,%s,%s,%s\n' % columns)
+
+    def writeChunk(self, r):
+        """Writes the rows of a chunk of objects.
+        """
+        for k in range(r.shape[0]):
+            name = self.names[self.nWritten + k]
+            rows = [self.pattern % ((name, t) + tuple(v)) for t, v in zip(self.times, r[k])]
+            self.f.writelines(rows)
+
+    def close(self):
+        self.f.close()
+
+class NpyWriter(Writer):
+    """Writes a single (N,T,3) array in NumPy's .npy format, memory-mapped so
+       that chunks are written directly to disk
+    """
+
+    def __init__(self, path, names, t_s, frame='eci', dtype=float):
+        """Allocates the full array on disk.
+        """
+        super(NpyWriter, self).__init__(path, names, t_s, frame, dtype)
+        shape = (len(self.names), self.t_s.shape[0], 3)
+        self.array = npformat.open_memmap(path, mode='w+', dtype=self.dtype, shape=shape)
+
+    def writeChunk(self, r):
+        """Copies a chunk of objects into the memory-mapped array.
+        """
+        self.array[self.nWritten:self.nWritten + r.shape[0]] = r
+
+    def close(self):
+        self.array.flush()
+        del self.array
+
+class BinWriter(Writer):
+    """Writes a binary ephemeris: a little-endian header (magic, object count,
+       sample count, start time and step in seconds since J2000, and frame),
+       fixed-width object names, then float64 (or float32, flagged by a
+       different magic value; see *magics*) (N,T,3) positions, object-major.
+       Assumes uniform time steps.
+    """
+
+    def __init__(self, path, names, t_s, frame='eci', dtype=float):
+        """Opens the file and writes the header and object names.
+        """
+        super(BinWriter, self).__init__(path, names, t_s, frame, dtype)
+        step_s = self.t_s[1] - self.t_s[0] if self.t_s.shape[0] > 1 else 0.0
+        self.code = self.dtype.newbyteorder('<').str
+        m = [k for k, v in magics.items() if v == self.code][0]
+        self.f = open(path, 'wb')
+        self.f.write(struct.pack(headerFormat, m, len(self.names), self.t_s.shape[0], self.t_s[0], step_s, frame.encode('ascii')))
+        for name in self.names:
+            self.f.write(name.encode('utf-8')[:nameLength].ljust(nameLength, b'\0'))
+
+    def writeChunk(self, r):
+        """Appends the positions of a chunk of objects.
+        """
+        self.f.write(numpy.ascontiguousarray(r, dtype=self.code).tobytes())
+
+    def close(self):
+        self.f.close()
+
+writers = {'csv': CsvWriter, 'npy': NpyWriter, 'bin': BinWriter}
+
+def getWriter(path, names, t_s, frame='eci', fmt=None, dtype=float):
+    """Returns a writer for the given path, with the format taken from the file
+       extension unless given explicitly ('csv', 'npy', or 'bin'), storing
+       positions with the given precision (float64 or float32).
+    """
+    if fmt is None:
+        fmt = os.path.splitext(path)[1].lstrip('.').lower()
+    if fmt not in writers:
+        raise ValueError('Unsupported ephemeris format "%s"' % fmt)
+    return writers[fmt](path, names, t_s, frame, dtype)
+
+def readBin(path):
+    """Reads a binary ephemeris, returning a tuple of object names, sample times
+       (seconds since J2000), frame name, and a memory-mapped (N,T,3) array.
+    """
+    with open(path, 'rb') as f:
+        head = f.read(struct.calcsize(headerFormat))
+        m, n, nt, t0_s, step_s, frame = struct.unpack(headerFormat, head)
+        if m not in magics:
+            raise ValueError('"%s" is not a binary ephemeris' % path)
+        names = [f.read(nameLength).rstrip(b'\0').decode('utf-8') for _ in range(n)]
+        offset = f.tell()
+    r = numpy.memmap(path, dtype=magics[m], mode='r', offset=offset, shape=(n, nt, 3))
+    return names, t0_s + step_s * numpy.arange(nt), frame.rstrip(b'\0').decode('ascii'), r
@@ -0,0 +1,98 @@
+"""Defines closed-form orbital event tables (apsides and node crossings) for
+   single orbits or whole populations. Because mean anomaly is linear in time,
+   event times follow directly from the mean motion (refined for the secular
+   drift of the argument of perigee under mean J2) without any sampling.
+"""
+
+import datetime
+import numpy
+from math import pi
+import oyb
+from oyb import anomaly, batch, earth
+
+perigee = 0
+apogee = 1
+ascNode = 2
+descNode = 3
+names = ('perigee', 'apogee', 'ascNode', 'descNode')
+
+def _sec(t):
+    """Returns the given time in seconds since J2000, accepting a datetime.
+    """
+    return earth.dt2sec(t) if isinstance(t, datetime.datetime) else float(t)
+
+def _expand(ndx, k0, k1):
+    """Expands per-object inclusive integer ranges [k0, k1] into flat arrays of
+       object indices and integers (all ranges, in object order).
+    """
+    counts = numpy.maximum(k1 - k0 + 1, 0)
+    objs = numpy.repeat(ndx, counts)
+    starts = numpy.repeat(k0 - numpy.cumsum(counts) + counts, counts)
+    return objs, starts + numpy.arange(objs.shape[0])
+
+def getTargetMean(pop, kind):
+    """Returns the mean anomaly at which each object reaches the given apsis
+       (0 at perigee, pi at apogee); node crossings are enumerated by argument
+       of latitude in *getTimes* instead.
+    """
+    return numpy.full(len(pop), 0 if kind == perigee else pi)
+
+def getTimes(pop, kind, tStart_s, tStop_s, nIter=3):
+    """Returns a tuple of object indices and times (seconds since J2000) of
+       every event of the given kind between the start and stop times, sorted
+       by object and then time. Node crossings are enumerated by revolutions
+       of the argument of latitude (advancing at the nodal rate, mean motion
+       plus perigee drift) and, for mean J2 objects, refined by fixed-point
+       iteration on the drifting argument of perigee, so that none are lost
+       however far the perigee turns over the span.
+    """
+    tStart_s, tStop_s = _sec(tStart_s), _sec(tStop_s)
+    n_radps = pop.getMeanMotion()
+    dAop_radps = pop.getAopRate()
+    ndx = numpy.arange(len(pop))
+    if kind in (ascNode, descNode):
+        u_rad = 0 if kind == ascNode else pi
+        cycles = lambda t_s: (pop.w_rad + pop.M_rad + (n_radps + dAop_radps) * (t_s - pop.tEpoch_s) - u_rad) / (2 * pi)
+        k0 = numpy.floor(cycles(tStart_s)).astype(int) - 1
+        k1 = numpy.ceil(cycles(tStop_s)).astype(int) + 1
+        objs, k = _expand(ndx, k0, k1)
+        tEpoch_s, e, w_rad, M_rad = pop.tEpoch_s[objs], pop.e[objs], pop.w_rad[objs], pop.M_rad[objs]
+        t_s = tEpoch_s + (2 * pi * k + u_rad - w_rad - M_rad) / (n_radps + dAop_radps)[objs]
+        for _ in range(nIter):
+            tht_rad = 2 * pi * k + u_rad - (w_rad + dAop_radps[objs] * (t_s - tEpoch_s))
+            target_rad = anomaly.ecc2mean(anomaly.true2eccUnwrapped(tht_rad, e), e)
+            t_s = tEpoch_s + (target_rad - M_rad) / n_radps[objs]
+    else:
+        M0_rad = getTargetMean(pop, kind)
+        cycles = lambda t_s: (pop.M_rad + n_radps * (t_s - pop.tEpoch_s) - M0_rad) / (2 * pi)
+        k0 = numpy.ceil(cycles(tStart_s)).astype(int) - 1
+        k1 = numpy.floor(cycles(tStop_s)).astype(int) + 1
+        objs, k = _expand(ndx, k0, k1)
+        t_s = pop.tEpoch_s[objs] + (2 * pi * k + M0_rad[objs] - pop.M_rad[objs]) / n_radps[objs]
+    isIn = (t_s >= tStart_s) & (t_s <= tStop_s)
+    return objs[isIn], t_s[isIn]
+
+def getEvents(pop, tStart_s, tStop_s, kinds=(perigee, apogee, ascNode, descNode), isStates=True):
+    """Returns an event table of every apsis and node crossing of the given
+       Population (or single Orbit) between the start and stop times (seconds
+       since J2000, or datetimes), as a dictionary of columns sorted by object
+       and then time: 'ndx' (object index), 't_s', and 'kind' (event code; see
+       *names*) and, if *isStates* is set, 'rEci_m' and 'vEci_mps' (K,3)
+       states at each event.
+    """
+    if isinstance(pop, oyb.Orbit):
+        pop = batch.Population.fromOrbits([pop])
+    objs, times, codes = [], [], []
+    for kind in kinds:
+        o, t = getTimes(pop, kind, tStart_s, tStop_s)
+        objs.append(o)
+        times.append(t)
+        codes.append(numpy.full(o.shape, kind, dtype=numpy.int8))
+    objs, times, codes = numpy.concatenate(objs), numpy.concatenate(times), numpy.concatenate(codes)
+    order = numpy.lexsort((times, objs))
+    table = {'ndx': objs[order], 't_s': times[order], 'kind': codes[order]}
+    if isStates:
+        rEci_m, vEci_mps = pop.subset(table['ndx']).getRVeci(table['t_s'].reshape(-1, 1))
+        table['rEci_m'] = rEci_m[:,0,:]
+        table['vEci_mps'] = vEci_mps[:,0,:]
+    return table
@@ -0,0 +1,244 @@
+"""Defines an indexed store of historical element sets (e.g., years of TLEs for
+   many objects), keyed by catalog number with sorted epochs. Supports
+   binary-search nearest-epoch and range queries, append-only ingestion of
+   new TLE batches, and on-disk persistence as memory-mappable columns.
+"""
+
+import os
+import glob
+import numpy
+from math import pi
+from oyb import batch, earth
+
+columns = ('id', 'tEpoch_s', 'a_m', 'e', 'i_rad', 'O_rad', 'w_rad', 'M_rad')
+alpha5 = '0123456789ABCDEFGHJKLMNPQRSTUVWXYZ'
+
+def _decodeIds(b):
+    """Decodes an (N,5) array of single-byte catalog number characters, in
+       the alpha-5 convention: a leading letter (skipping I and O) stands for
+       10 through 33 ten-thousands, so that "A0001" is 100001. Raises a
+       ValueError for any other leading character.
+    """
+    lookup = numpy.full(256, -1, dtype=int)
+    lookup[ord(' ')] = 0
+    for value, char in enumerate(alpha5):
+        lookup[ord(char)] = value
+    first = lookup[b[:,0].view(numpy.uint8)]
+    if numpy.any(first < 0):
+        bad = b[first < 0][0].tobytes().decode('ascii', 'replace')
+        raise ValueError('Invalid catalog number "%s"' % bad)
+    return first * 10000 + b[:,1:5].copy().view('S4')[:,0].astype(int)
+
+def parseTle(text):
+    """Parses the text of a TLE batch (with or without title lines) into a
+       dictionary of element columns (see *columns*) with one entry per
+       element set, using the same conventions as *Orbit.fromTle*. Catalog
+       numbers may be given in the alpha-5 form (see *_decodeIds*).
+    """
+    lines = [l.rstrip() for l in text.splitlines()]
+    l1 = [l for l, m in zip(lines, lines[1:] + ['']) if l.startswith('1 ') and m.startswith('2 ')]
+    l2 = [m for l, m in zip(lines, lines[1:] + ['']) if l.startswith('1 ') and m.startswith('2 ')]
+    if len(l1) == 0:
+        return dict((c, numpy.zeros(0, dtype=int if c == 'id' else float)) for c in columns)
+    b1 = numpy.array([l.ljust(69)[:69] for l in l1], dtype='S69').view('S1').reshape(len(l1), 69)
+    b2 = numpy.array([l.ljust(69)[:69] for l in l2], dtype='S69').view('S1').reshape(len(l2), 69)
+    field = lambda b, i0, i1: b[:,i0:i1].copy().view('S%u' % (i1 - i0))[:,0]
+    ey = field(b1, 18, 20).astype(int)
+    ed = field(b1, 20, 32).astype(float)
+    years = numpy.where(ey < 50, 2000 + ey, 1900 + ey)
+    jan1_s = ((years - 1970).astype('datetime64[Y]').astype('datetime64[s]') - numpy.datetime64(earth.j2000_dt, 's')).astype(float)
+    mm = field(b2, 52, 63).astype(float)
+    return {
+        'id': _decodeIds(b1[:,2:7]),
+        'tEpoch_s': jan1_s + (ed - 1) * 86400,
+        'a_m': (earth.mu_m3ps2 * (86400 / (2 * pi * mm))**2)**(1/3),
+        'e': numpy.char.add(b'.', field(b2, 26, 33)).astype(float),
+        'i_rad': field(b2, 8, 16).astype(float) * pi / 180,
+        'O_rad': field(b2, 17, 25).astype(float) * pi / 180,
+        'w_rad': field(b2, 34, 42).astype(float) * pi / 180,
+        'M_rad': field(b2, 43, 51).astype(float) * pi / 180,
+    }
+
+def _concat(parts):
+    """Concatenates a sequence of column dictionaries.
+    """
+    return dict((c, numpy.concatenate([p[c] for p in parts])) for c in columns)
+
+def _sort(data):
+    """Returns the given element columns sorted by catalog number and then
+       epoch, keeping only the last of any repeated (number, epoch) pairs.
+    """
+    order = numpy.lexsort((numpy.arange(data['id'].shape[0]), data['tEpoch_s'], data['id']))
+    data = dict((c, numpy.asarray(data[c])[order]) for c in columns)
+    isLast = numpy.ones(data['id'].shape[0], dtype=bool)
+    isLast[:-1] = (data['id'][1:] != data['id'][:-1]) | (data['tEpoch_s'][1:] != data['tEpoch_s'][:-1])
+    return dict((c, data[c][isLast]) for c in columns)
+
+def _search(ids, t_s, qIds, qt_s):
+    """Returns the insertion points (left side) of the given (catalog number,
+       epoch) pairs within the given sorted columns: a binary search on the
+       number, then a vectorized bisection over each number's epochs.
+    """
+    lo = numpy.searchsorted(ids, qIds, side='left')
+    hi = numpy.searchsorted(ids, qIds, side='right')
+    while numpy.any(lo < hi):
+        mid = (lo + hi) // 2
+        isActive = lo < hi
+        isBefore = t_s[numpy.minimum(mid, ids.shape[0] - 1)] < qt_s
+        lo = numpy.where(isActive & isBefore, mid + 1, lo)
+        hi = numpy.where(isActive & ~isBefore, mid, hi)
+    return lo
+
+class TleHistory(object):
+    """Element sets of many objects over time, sorted by catalog number and
+       then epoch
+    """
+
+    def __init__(self, path=None):
+        """Initializes an empty store or, if the given directory exists, loads
+           it (base columns are memory-mapped). When a path is given, ingested
+           batches are also appended to it as new segment files.
+        """
+        self.path = path
+        self.data = dict((c, numpy.zeros(0, dtype=int if c == 'id' else float)) for c in columns)
+        self.nSegments = 0
+        if path is not None and os.path.isdir(path):
+            if os.path.exists(os.path.join(path, 'id.npy')):
+                self.data = dict((c, numpy.load(os.path.join(path, c + '.npy'), mmap_mode='r')) for c in columns)
+            segments = sorted(glob.glob(os.path.join(path, 'segment-*.npz')))
+            for s in segments:
+                with numpy.load(s) as z:
+                    self.merge(dict((c, z[c]) for c in columns))
+            self.nSegments = len(segments)
+        self.index()
+
+    def __len__(self):
+        """Returns the number of element sets in the store.
+        """
+        return self.data['id'].shape[0]
+
+    def index(self):
+        """Rebuilds the per-object index of row ranges after the (sorted) data
+           has changed, in a single linear pass.
+        """
+        id = numpy.asarray(self.data['id'])
+        starts = numpy.flatnonzero(numpy.concatenate(([True], id[1:] != id[:-1]))) if len(self) > 0 else numpy.zeros(0, dtype=int)
+        self.ids = id[starts]
+        stops = numpy.append(starts[1:], len(self))
+        self.ranges = dict(zip(self.ids.tolist(), zip(starts.tolist(), stops.tolist())))
+
+    def merge(self, new):
+        """Merges the given element columns into the sorted data, keeping the
+           most recently ingested set where catalog number and epoch repeat.
+           Only the new rows are sorted; they are then located in the existing
+           columns by binary search and inserted (or, for repeats, written
+           over) in one pass, so small batches never re-sort the store.
+        """
+        new = _sort(new)
+        if len(self) == 0:
+            self.data = new
+            return
+        ids, t_s = self.data['id'], self.data['tEpoch_s']
+        pos = _search(ids, t_s, new['id'], new['tEpoch_s'])
+        at = numpy.minimum(pos, len(self) - 1)
+        isRepeat = (pos < len(self)) & (ids[at] == new['id']) & (t_s[at] == new['tEpoch_s'])
+        ins = pos[~isRepeat]
+        shifted = pos[isRepeat] + numpy.searchsorted(ins, pos[isRepeat], side='right')
+        data = {}
+        for c in columns:
+            data[c] = numpy.insert(self.data[c], ins, new[c][~isRepeat])
+            data[c][shifted] = new[c][isRepeat]
+        self.data = data
+
+    def ingest(self, text):
+        """Appends a batch of TLEs (as text) to the store, persisting it as a
+           new segment if the store has a path. Returns the number of element
+           sets parsed.
+        """
+        new = parseTle(text)
+        if self.path is not None:
+            os.makedirs(self.path, exist_ok=True)
+            numpy.savez(os.path.join(self.path, 'segment-%06u.npz' % self.nSegments), **new)
+            self.nSegments += 1
+        self.merge(new)
+        self.index()
+        return new['id'].shape[0]
+
+    def save(self, path=None):
+        """Writes the full store to the given (or its own) directory as one
+           .npy file per column, replacing any appended segments.
+        """
+        path = path if path is not None else self.path
+        os.makedirs(path, exist_ok=True)
+        data = dict((c, numpy.array(self.data[c])) for c in columns)
+        for c in columns:
+            numpy.save(os.path.join(path, c + '.npy'), data[c])
+        for s in glob.glob(os.path.join(path, 'segment-*.npz')):
+            os.remove(s)
+        self.data = data
+        if path == self.path:
+            self.nSegments = 0
+
+    def getRange(self, id, tStart_s=None, tStop_s=None):
+        """Returns the slice of rows holding element sets of the given object
+           with epochs within the given (inclusive) window, in seconds since
+           J2000; open-ended if either bound is None.
+        """
+        start, stop = self.ranges.get(id, (0, 0))
+        t_s = self.data['tEpoch_s'][start:stop]
+        i0 = 0 if tStart_s is None else numpy.searchsorted(t_s, tStart_s, side='left')
+        i1 = t_s.shape[0] if tStop_s is None else numpy.searchsorted(t_s, tStop_s, side='right')
+        return slice(start + int(i0), start + int(i1))
+
+    def getNearest(self, id, t_s):
+        """Returns the row of the element set of the given object with the
+           epoch nearest to the given time (seconds since J2000). Raises a
+           KeyError if the object is not in the store.
+        """
+        start, stop = self.ranges[id]
+        tEpoch_s = self.data['tEpoch_s']
+        i = start + int(numpy.searchsorted(tEpoch_s[start:stop], t_s))
+        if i == stop or (i > start and t_s - tEpoch_s[i-1] <= tEpoch_s[i] - t_s):
+            i -= 1
+        return i
+
+    def selectNearest(self, ids, t_s):
+        """Returns the rows of the element sets nearest to each of the given
+           (object, time) pairs, searching all times of each object at once.
+           Objects not in the store yield a row of -1.
+        """
+        ids, t_s = numpy.broadcast_arrays(numpy.asarray(ids), numpy.asarray(t_s, dtype=float))
+        rows = numpy.full(ids.shape, -1, dtype=int)
+        tEpoch_s = self.data['tEpoch_s']
+        for id in numpy.unique(ids).tolist():
+            if id not in self.ranges:
+                continue
+            start, stop = self.ranges[id]
+            isId = ids == id
+            tq_s = t_s[isId]
+            i = start + numpy.searchsorted(tEpoch_s[start:stop], tq_s)
+            iPrev = numpy.maximum(i - 1, start)
+            iNext = numpy.minimum(i, stop - 1)
+            rows[isId] = numpy.where(numpy.abs(tq_s - tEpoch_s[iPrev]) <= numpy.abs(tEpoch_s[iNext] - tq_s), iPrev, iNext)
+        return rows
+
+    def getColumns(self, rows):
+        """Returns a dictionary of element column arrays for the given rows
+           (indices, mask, or slice).
+        """
+        return dict((c, numpy.array(self.data[c][rows])) for c in columns)
+
+    def getPopulation(self, rows, isJ2=False):
+        """Returns a Population of the element sets at the given rows, named
+           by catalog number.
+        """
+        d = self.getColumns(rows)
+        return batch.Population(d['a_m'], e=d['e'], i_rad=d['i_rad'], O_rad=d['O_rad'],
+            w_rad=d['w_rad'], M_rad=d['M_rad'], tEpoch_s=d['tEpoch_s'], isJ2=isJ2,
+            names=[str(id) for id in d['id'].tolist()])
+
+    def getOrbits(self, rows, isJ2=False):
+        """Returns a list of Orbit (or, if *isJ2*, MeanJ2) objects for the
+           element sets at the given rows.
+        """
+        return self.getPopulation(rows, isJ2).toOrbits()
@@ -0,0 +1,127 @@
+"""Defines a vectorized solver for Lambert's problem (the transfer orbit that
+   connects two positions in a given time) using universal variables (after
+   Curtis, Algorithm 5.2), and evaluation of departure/arrival transfer grids
+   ("porkchop" plots) between two propagated objects.
+"""
+
+import numpy
+from math import pi
+import oyb
+from oyb import batch, earth
+
+def stumpff(z):
+    """Returns the Stumpff functions S(z) and C(z) for an array of universal
+       anomaly parameters, using series expansions near zero.
+    """
+    z = numpy.asarray(z, dtype=float)
+    s = numpy.sqrt(numpy.abs(z))
+    with numpy.errstate(all='ignore'):
+        S = numpy.where(z > 0, (s - numpy.sin(s)) / s**3, (numpy.sinh(s) - s) / s**3)
+        C = numpy.where(z > 0, (1 - numpy.cos(s)) / z, (numpy.cosh(s) - 1) / -z)
+    isSmall = numpy.abs(z) < 1e-3
+    S = numpy.where(isSmall, 1 / 6 - z / 120 + z**2 / 5040, S)
+    C = numpy.where(isSmall, 1 / 2 - z / 24 + z**2 / 720, C)
+    return S, C
+
+def getTransferTime(z, r1_m, r2_m, A_m):
+    """Returns the time of flight (seconds) of the transfer with the given
+       universal anomaly parameter, or -inf where no transfer exists (y < 0).
+    """
+    S, C = stumpff(z)
+    with numpy.errstate(all='ignore'):
+        y_m = r1_m + r2_m + A_m * (z * S - 1) / C**0.5
+        t_s = ((y_m / C)**1.5 * S + A_m * y_m**0.5) / earth.mu_m3ps2**0.5
+    return numpy.where(y_m < 0, -numpy.inf, t_s)
+
+def solve(r1Eci_m, r2Eci_m, dt_s, isPrograde=True, nIter=64):
+    """Solves Lambert's problem (zero-revolution) for arrays of initial and
+       final ECI positions ((...,3), meters) and flight times (seconds), all
+       broadcast together. Returns a tuple of departure and arrival velocity
+       arrays ((...,3), meters per second); entries without a solution
+       (non-positive times, or 180-degree transfers) are NaN. The universal
+       anomaly parameter is found by whole-array bisection on time of flight,
+       which increases monotonically with it.
+    """
+    r1Eci_m, r2Eci_m = numpy.broadcast_arrays(numpy.asarray(r1Eci_m, dtype=float), numpy.asarray(r2Eci_m, dtype=float))
+    shape = numpy.broadcast_shapes(r1Eci_m.shape[:-1], numpy.shape(dt_s), numpy.shape(isPrograde))
+    r1Eci_m = numpy.broadcast_to(r1Eci_m, shape + (3,))
+    r2Eci_m = numpy.broadcast_to(r2Eci_m, shape + (3,))
+    dt_s = numpy.broadcast_to(numpy.asarray(dt_s, dtype=float), shape)
+    isPrograde = numpy.broadcast_to(isPrograde, shape)
+    r1_m = numpy.sum(r1Eci_m**2, axis=-1)**0.5
+    r2_m = numpy.sum(r2Eci_m**2, axis=-1)**0.5
+    cz_m2 = numpy.cross(r1Eci_m, r2Eci_m)[...,2]
+    dTht_rad = numpy.arccos(numpy.clip(numpy.sum(r1Eci_m * r2Eci_m, axis=-1) / (r1_m * r2_m), -1, 1))
+    isLong = numpy.where(isPrograde, cz_m2 < 0, cz_m2 >= 0)
+    dTht_rad = numpy.where(isLong, 2 * pi - dTht_rad, dTht_rad)
+    with numpy.errstate(all='ignore'):
+        A_m = numpy.sin(dTht_rad) * (r1_m * r2_m / (1 - numpy.cos(dTht_rad)))**0.5
+    v1Eci_mps = numpy.full(shape + (3,), numpy.nan)
+    v2Eci_mps = numpy.full(shape + (3,), numpy.nan)
+    isOk = (dt_s > 0) & numpy.isfinite(A_m) & (numpy.abs(A_m) > 1e-9 * (r1_m * r2_m)**0.5)
+    r1_m, r2_m, A_m, dt_s = r1_m[isOk], r2_m[isOk], A_m[isOk], dt_s[isOk]
+    lo = numpy.full(dt_s.shape, -4 * pi**2)
+    hi = numpy.full(dt_s.shape, 4 * pi**2 * (1 - 1e-12))
+    with numpy.errstate(all='ignore'):
+        for _ in range(16):
+            isHigh = getTransferTime(lo, r1_m, r2_m, A_m) > dt_s
+            if not numpy.any(isHigh):
+                break
+            lo = numpy.where(isHigh, 4 * lo, lo)
+        for _ in range(nIter):
+            z = 0.5 * (lo + hi)
+            isLow = getTransferTime(z, r1_m, r2_m, A_m) < dt_s
+            lo = numpy.where(isLow, z, lo)
+            hi = numpy.where(isLow, hi, z)
+        z = 0.5 * (lo + hi)
+        S, C = stumpff(z)
+        y_m = r1_m + r2_m + A_m * (z * S - 1) / C**0.5
+        f = 1 - y_m / r1_m
+        g_s = A_m * (y_m / earth.mu_m3ps2)**0.5
+        gdot = 1 - y_m / r2_m
+        r1Eci_m, r2Eci_m = r1Eci_m[isOk], r2Eci_m[isOk]
+        v1 = (r2Eci_m - f[:,numpy.newaxis] * r1Eci_m) / g_s[:,numpy.newaxis]
+        v2 = (gdot[:,numpy.newaxis] * r2Eci_m - r1Eci_m) / g_s[:,numpy.newaxis]
+    v1[y_m < 0] = numpy.nan
+    v2[y_m < 0] = numpy.nan
+    v1Eci_mps[isOk] = v1
+    v2Eci_mps[isOk] = v2
+    return v1Eci_mps, v2Eci_mps
+
+def porkchop(depart, arrive, tDep_s, tArr_s, isPrograde=True):
+    """Evaluates transfers from one object (single-member Population or Orbit)
+       to another over every combination of the given departure and arrival
+       times (seconds since J2000), in one vectorized call. Returns a
+       dictionary of (D,A) arrays: departure, arrival, and total delta-v
+       ('dv1_mps', 'dv2_mps', 'dv_mps', in meters per second; NaN where the
+       arrival does not follow departure) and flight times ('dt_s'). If
+       *isPrograde* is None, the cheaper of the prograde and retrograde
+       transfers is taken for each combination. Raises a ValueError for
+       Populations of any other size than one.
+    """
+    if isinstance(depart, oyb.Orbit):
+        depart = batch.Population.fromOrbits([depart])
+    if isinstance(arrive, oyb.Orbit):
+        arrive = batch.Population.fromOrbits([arrive])
+    for pop in (depart, arrive):
+        if len(pop) != 1:
+            raise ValueError('Porkchop endpoints must be single objects (got a Population of %u)' % len(pop))
+    tDep_s = numpy.asarray(tDep_s, dtype=float)
+    tArr_s = numpy.asarray(tArr_s, dtype=float)
+    r1_m, v1_mps = depart.getRVeci(tDep_s)
+    r2_m, v2_mps = arrive.getRVeci(tArr_s)
+    r1_m, v1_mps = r1_m[0][:,numpy.newaxis,:], v1_mps[0][:,numpy.newaxis,:]
+    r2_m, v2_mps = r2_m[0][numpy.newaxis,:,:], v2_mps[0][numpy.newaxis,:,:]
+    dt_s = tArr_s[numpy.newaxis,:] - tDep_s[:,numpy.newaxis]
+    results = []
+    for prograde in ((True, False) if isPrograde is None else (isPrograde,)):
+        v1L_mps, v2L_mps = solve(r1_m, r2_m, dt_s, prograde)
+        dv1_mps = numpy.sum((v1L_mps - v1_mps)**2, axis=-1)**0.5
+        dv2_mps = numpy.sum((v2_mps - v2L_mps)**2, axis=-1)**0.5
+        results.append((dv1_mps, dv2_mps))
+    dv1_mps, dv2_mps = results[0]
+    if len(results) > 1:
+        isBetter = numpy.fmin(results[1][0] + results[1][1], numpy.inf) < numpy.fmin(dv1_mps + dv2_mps, numpy.inf)
+        dv1_mps = numpy.where(isBetter, results[1][0], dv1_mps)
+        dv2_mps = numpy.where(isBetter, results[1][1], dv2_mps)
+    return {'dv1_mps': dv1_mps, 'dv2_mps': dv2_mps, 'dv_mps': dv1_mps + dv2_mps, 'dt_s': dt_s}
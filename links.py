@@ -0,0 +1,144 @@
+"""Defines time-varying inter-satellite line-of-sight link graphs. At each time
+   step, candidate pairs are found with a uniform spatial grid (cells half as
+   large as the maximum link range, searched two cells out, and hashed
+   together with the time step so that many steps are indexed at once), then
+   filtered by range and by a vectorized
+   test against earth occlusion (the equatorial radius plus a grazing
+   margin). Links are returned as sparse edge lists with per-step offsets.
+"""
+
+import numpy
+from oyb import earth
+
+def isClear(r1_m, r2_m, rMin_m=earth.eqRad_m + 1e5):
+    """Returns boolean flags (over the leading axes of the given position
+       arrays) that are set where the segment between the two positions stays
+       at least *rMin_m* meters from the center of the earth.
+    """
+    d_m = r2_m - r1_m
+    d2_m2 = numpy.einsum('...i,...i->...', d_m, d_m)
+    rd_m2 = numpy.einsum('...i,...i->...', r1_m, d_m)
+    r2_m2 = numpy.einsum('...i,...i->...', r1_m, r1_m)
+    return _isClear(r2_m2, rd_m2, d2_m2, rMin_m)
+
+def _isClear(r2_m2, rd_m2, d2_m2, rMin_m):
+    """Returns the flags of *isClear* from the squared radius of the first
+       point, its dot product with the separation, and the squared separation.
+    """
+    with numpy.errstate(all='ignore'):
+        s = numpy.where(d2_m2 > 0, numpy.clip(-rd_m2 / d2_m2, 0, 1), 0)
+    return r2_m2 + s * (2 * rd_m2 + s * d2_m2) >= rMin_m**2
+
+def _pairs(starts, counts, first):
+    """Expands, for each of the given points, the range of *counts* sorted
+       positions beginning at *starts* into flat arrays of (point, position)
+       pairs.
+    """
+    counts = numpy.maximum(counts, 0)
+    a = numpy.repeat(first, counts)
+    offsets = numpy.arange(a.shape[0]) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+    return a, numpy.repeat(starts, counts) + offsets
+
+def getCandidates(rEci_m, cell_m, steps=None, reach=1):
+    """Returns a tuple of index arrays (i, j) of every pair of the given (P,3)
+       points whose spatial grid cells (of the given size) are within *reach*
+       cells of each other along every axis (by default, the same or adjacent
+       cells), with each pair listed once (i < j in sorted order, not
+       necessarily by index). If *steps* (per-point integer labels, e.g. time
+       step indices) are given, only points with equal labels are paired.
+       Neighboring cells along the last axis have consecutive keys, so each
+       column of them is found with one range lookup.
+    """
+    P = rEci_m.shape[0]
+    steps = numpy.zeros(P, dtype=numpy.int64) if steps is None else numpy.asarray(steps, dtype=numpy.int64)
+    cells = numpy.floor(rEci_m / cell_m).astype(numpy.int64)
+    cells -= cells.min(axis=0) - reach
+    B = int(cells.max()) + reach + 1
+    if float(B)**3 * (int(steps.max(initial=0)) + 1) >= 2.0**62:
+        raise ValueError('Too many grid cells (%u per axis) for the cell size; use a larger cell or fewer steps' % B)
+    key = lambda c, s: ((s * B + c[...,0]) * B + c[...,1]) * B + c[...,2]
+    keys = key(cells, steps)
+    order = numpy.argsort(keys, kind='stable')
+    uKeys, uStarts, uCounts = numpy.unique(keys[order], return_index=True, return_counts=True)
+    bounds = numpy.append(uStarts, P)
+    cellOf = numpy.repeat(numpy.arange(uKeys.shape[0]), uCounts)
+    position = numpy.arange(P)
+    uCells = cells[order][uStarts]
+    uSteps = steps[order][uStarts]
+    iAll, jAll = [], []
+    columns = [(dx, dy) for dx in range(-reach, reach + 1) for dy in range(-reach, reach + 1) if (dx, dy) >= (0, 0)]
+    for dx, dy in columns:
+        hi = bounds[numpy.searchsorted(uKeys, key(uCells + [dx, dy, reach], uSteps), side='right')]
+        if (dx, dy) == (0, 0):
+            a, b = _pairs(position + 1, hi[cellOf] - position - 1, position)
+        else:
+            lo = bounds[numpy.searchsorted(uKeys, key(uCells + [dx, dy, -reach], uSteps), side='left')]
+            a, b = _pairs(lo[cellOf], (hi - lo)[cellOf], position)
+        iAll.append(a)
+        jAll.append(b)
+    i, j = numpy.concatenate(iAll), numpy.concatenate(jAll)
+    return order[i], order[j]
+
+def getLinks(pop, t_s, maxRange_m, margin_m=1e5, nPoints=200000):
+    """Builds the line-of-sight link graph of the given Population over the
+       given (T,) times (seconds since J2000): at each step, every pair of
+       objects within *maxRange_m* meters of each other whose connecting
+       segment clears the earth (equatorial radius plus *margin_m* meters).
+       Returns a dictionary of edge arrays sorted by step and then object
+       indices: 'i' and 'j' (object indices, i < j), 'range_m', and
+       'rangeRate_mps', along with 'indptr', a (T+1,) array of offsets such
+       that the edges of step k are those from indptr[k] to indptr[k+1].
+       Steps are evaluated in chunks of about *nPoints* object-times.
+    """
+    t_s = numpy.atleast_1d(numpy.asarray(t_s, dtype=float))
+    N = len(pop)
+    rMin_m = earth.eqRad_m + margin_m
+    nChunk = max(1, nPoints // max(N, 1))
+    cols = dict((c, []) for c in ('step', 'i', 'j', 'range_m', 'rangeRate_mps'))
+    for k0 in range(0, t_s.shape[0], nChunk):
+        tc_s = t_s[k0:k0 + nChunk]
+        rEci_m, vEci_mps = pop.getRVeci(tc_s)
+        rEci_m = rEci_m.transpose(1, 0, 2).reshape(-1, 3)
+        x_m, y_m, z_m = numpy.ascontiguousarray(rEci_m.T)
+        vx_mps, vy_mps, vz_mps = numpy.ascontiguousarray(vEci_mps.transpose(2, 1, 0).reshape(3, -1))
+        steps = numpy.repeat(numpy.arange(tc_s.shape[0]), N)
+        a, b = getCandidates(rEci_m, 0.5 * maxRange_m, steps, reach=2)
+        dx_m, dy_m, dz_m = x_m[b] - x_m[a], y_m[b] - y_m[a], z_m[b] - z_m[a]
+        d2_m2 = dx_m * dx_m + dy_m * dy_m + dz_m * dz_m
+        ndx = numpy.flatnonzero(d2_m2 <= maxRange_m**2)
+        a, b, dx_m, dy_m, dz_m, d2_m2 = a[ndx], b[ndx], dx_m[ndx], dy_m[ndx], dz_m[ndx], d2_m2[ndx]
+        xa_m, ya_m, za_m = x_m[a], y_m[a], z_m[a]
+        rd_m2 = xa_m * dx_m + ya_m * dy_m + za_m * dz_m
+        ndx = numpy.flatnonzero(_isClear(xa_m * xa_m + ya_m * ya_m + za_m * za_m, rd_m2, d2_m2, rMin_m))
+        a, b, dx_m, dy_m, dz_m, d2_m2 = a[ndx], b[ndx], dx_m[ndx], dy_m[ndx], dz_m[ndx], d2_m2[ndx]
+        range_m = d2_m2**0.5
+        rangeRate_mps = (dx_m * (vx_mps[b] - vx_mps[a]) + dy_m * (vy_mps[b] - vy_mps[a]) + dz_m * (vz_mps[b] - vz_mps[a])) / range_m
+        step = a // N
+        i, j = numpy.minimum(a, b) % N, numpy.maximum(a, b) % N
+        order = numpy.argsort((step * N + i) * N + j)
+        cols['step'].append(k0 + step[order])
+        cols['i'].append(i[order])
+        cols['j'].append(j[order])
+        cols['range_m'].append(range_m[order])
+        cols['rangeRate_mps'].append(rangeRate_mps[order])
+    links = dict((c, numpy.concatenate(v)) for c, v in cols.items())
+    links['indptr'] = numpy.searchsorted(links['step'], numpy.arange(t_s.shape[0] + 1))
+    return links
+
+def iterLinks(pop, t_s, maxRange_m, margin_m=1e5, nSteps=360):
+    """Yields the link graph of the given Population over consecutive blocks of
+       *nSteps* of the given times, as tuples of the index of the first step
+       in the block and that block's *getLinks* dictionary, so that dense
+       graphs over long spans can be consumed (or written) without holding
+       every edge in memory.
+    """
+    t_s = numpy.atleast_1d(numpy.asarray(t_s, dtype=float))
+    for k0 in range(0, t_s.shape[0], nSteps):
+        yield k0, getLinks(pop, t_s[k0:k0 + nSteps], maxRange_m, margin_m)
+
+def getStep(links, k):
+    """Returns the edges of the given link graph at step *k*, as a dictionary
+       of 'i', 'j', 'range_m', and 'rangeRate_mps' arrays.
+    """
+    ndx = slice(links['indptr'][k], links['indptr'][k + 1])
+    return dict((c, links[c][ndx]) for c in ('i', 'j', 'range_m', 'rangeRate_mps'))
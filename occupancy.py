@@ -0,0 +1,103 @@
+"""Defines catalog occupancy and spatial density statistics: object counts by
+   altitude shell and inclination band, time-averaged shell occupancy and
+   density from the analytic orbit-averaged radial distribution (the fraction
+   of each period spent below a given radius follows in closed form from
+   Kepler's equation), and 3d histograms of per-epoch position snapshots.
+"""
+
+import numpy
+from oyb import earth
+
+def _cdf(a_m, e, r_m):
+    """Returns the fraction of the period spent at or below the given radius,
+       elementwise over broadcast arrays of semimajor axis, eccentricity, and
+       radius.
+    """
+    with numpy.errstate(all='ignore'):
+        E_rad = numpy.arccos(numpy.clip((1 - r_m / a_m) / e, -1, 1))
+    return numpy.where(e > 0, (E_rad - e * numpy.sin(E_rad)) / numpy.pi, (r_m >= a_m).astype(float))
+
+def getRadialCdf(pop, r_m):
+    """Returns an (N,R) array of the fraction of each orbit's period spent at or
+       below each of the given radii (meters). Between perigee and apogee this
+       is M/pi, for the mean anomaly M at which the radius a(1 - e cos E) is
+       reached; circular orbits step from 0 to 1 at their radius.
+    """
+    return _cdf(pop.a_m[:,numpy.newaxis], pop.e[:,numpy.newaxis], numpy.asarray(r_m, dtype=float)[numpy.newaxis,:])
+
+def getShellFractions(pop, r_m):
+    """Returns a sparse form of the fraction of each orbit's period spent in
+       each radial shell between the given sorted radii (meters), as a tuple
+       of object index, shell index, and fraction arrays. Only the shells
+       between perigee and apogee of each object are listed (at least one, if
+       within the radii), so the cost scales with the shells actually crossed.
+    """
+    r_m = numpy.asarray(r_m, dtype=float)
+    k0 = numpy.searchsorted(r_m, pop.a_m * (1 - pop.e), side='right')
+    k1 = numpy.maximum(numpy.searchsorted(r_m, pop.a_m * (1 + pop.e), side='left'), k0)
+    counts = k1 - k0 + 1
+    objs = numpy.repeat(numpy.arange(len(pop)), counts)
+    j = numpy.arange(objs.shape[0]) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+    isLast = j == counts[objs] - 1
+    shells = k0[objs] - 1 + j
+    edges = numpy.minimum(shells + 1, r_m.shape[0] - 1)
+    upper = numpy.where(isLast, 1, _cdf(pop.a_m[objs], pop.e[objs], r_m[edges]))
+    lower = numpy.concatenate(([0], upper[:-1]))
+    lower[j == 0] = 0
+    isIn = (shells >= 0) & (shells < r_m.shape[0] - 1)
+    return objs[isIn], shells[isIn], (upper - lower)[isIn]
+
+def _bands(pop, incEdges_rad):
+    """Returns the index of the inclination band of each object, or -1 for
+       objects outside every band.
+    """
+    ndx = numpy.searchsorted(incEdges_rad, pop.i_rad, side='right') - 1
+    ndx[pop.i_rad == incEdges_rad[-1]] = incEdges_rad.shape[0] - 2
+    return numpy.where((ndx >= 0) & (ndx < incEdges_rad.shape[0] - 1), ndx, -1)
+
+def getCounts(pop, altEdges_m, incEdges_rad=(0, numpy.pi)):
+    """Returns an (S,B) histogram of the number of objects in each altitude
+       shell (by mean altitude, a minus the equatorial radius, in meters) and
+       inclination band (radians), given the S+1 and B+1 bin edges.
+    """
+    counts, _, _ = numpy.histogram2d(pop.a_m - earth.eqRad_m, pop.i_rad, bins=(numpy.asarray(altEdges_m, dtype=float), numpy.asarray(incEdges_rad, dtype=float)))
+    return counts
+
+def getOccupancy(pop, altEdges_m, incEdges_rad=(0, numpy.pi)):
+    """Returns an (S,B) array of the time-averaged number of objects within each
+       altitude shell (meters above the equatorial radius) and inclination band
+       (radians): each object contributes the fraction of its period spent
+       in the shell, from the analytic radial distribution.
+    """
+    altEdges_m = numpy.asarray(altEdges_m, dtype=float)
+    incEdges_rad = numpy.asarray(incEdges_rad, dtype=float)
+    objs, shells, fractions = getShellFractions(pop, earth.eqRad_m + altEdges_m)
+    bands = _bands(pop, incEdges_rad)[objs]
+    isIn = bands >= 0
+    nBands = incEdges_rad.shape[0] - 1
+    total = numpy.bincount(shells[isIn] * nBands + bands[isIn], weights=fractions[isIn], minlength=(altEdges_m.shape[0] - 1) * nBands)
+    return total.reshape(-1, nBands)
+
+def getDensity(pop, altEdges_m, incEdges_rad=(0, numpy.pi)):
+    """Returns an (S,B) array of time-averaged spatial density (objects per
+       cubic meter) within each altitude shell, split by the inclination band
+       of the contributing objects: the occupancy of *getOccupancy* divided by
+       the volume of each spherical shell.
+    """
+    r_m = earth.eqRad_m + numpy.asarray(altEdges_m, dtype=float)
+    volume_m3 = 4 / 3 * numpy.pi * numpy.diff(r_m**3)
+    return getOccupancy(pop, altEdges_m, incEdges_rad) / volume_m3[:,numpy.newaxis]
+
+def getSnapshot(pop, t_s, bins=64, extent_m=None, frame='eci'):
+    """Returns a 3d histogram of the positions of every object at the given
+       time (seconds since J2000) in the given frame ('eci' or 'ecf'), as a
+       tuple of the counts array and the list of bin edges for each axis (see
+       *numpy.histogramdd*). Bins span a cube of +/- *extent_m* meters
+       (by default, just enough to hold every object).
+    """
+    if frame not in ('eci', 'ecf'):
+        raise ValueError('Unsupported snapshot frame "%s"' % frame)
+    r_m = pop.getPosition(float(t_s), frame)
+    if extent_m is None:
+        extent_m = numpy.max(numpy.abs(r_m)) * (1 + 1e-9) if r_m.shape[0] > 0 else 1
+    return numpy.histogramdd(r_m, bins=bins, range=[(-extent_m, extent_m)] * 3)
@@ -0,0 +1,83 @@
+"""Defines batched relative-motion transforms of many deputies with respect to a
+   chief, expressed in the chief's rotating radial/in-track/cross-track (RIC,
+   or LVLH) frame. Rotations are built as (T,3,3) stacks over the time grid
+   and applied to all deputies at once, with an optional closed-form
+   Clohessy-Wiltshire (CW) mode for fast approximate relative motion.
+"""
+
+import numpy
+import oyb
+from oyb import batch
+
+def _population(obj):
+    """Returns the given Orbit as a single-member Population; Populations are
+       returned as-is.
+    """
+    return batch.Population.fromOrbits([obj]) if isinstance(obj, oyb.Orbit) else obj
+
+def getQeci2ric(rEci_m, vEci_mps):
+    """Returns a (...,3,3) stack of transformations from the ECI frame to the RIC
+       frame defined by each of the given chief ECI position and velocity
+       vectors (trailing axis of three components): radial along the position,
+       cross-track along the angular momentum, and in-track completing the
+       right-handed set.
+    """
+    r = rEci_m / numpy.sum(rEci_m**2, axis=-1, keepdims=True)**0.5
+    h = numpy.cross(rEci_m, vEci_mps)
+    c = h / numpy.sum(h**2, axis=-1, keepdims=True)**0.5
+    return numpy.stack((r, numpy.cross(c, r), c), axis=-2)
+
+def eci2ric(rChief_m, vChief_mps, rEci_m, vEci_mps):
+    """Returns the position (meters) and velocity (meters per second) of the
+       given deputy ECI states ((N,T,3)) relative to the chief states ((T,3)),
+       as seen in the rotating RIC frame of the chief; velocities account for
+       the frame rotation rate h/r^2.
+    """
+    Q = getQeci2ric(rChief_m, vChief_mps)
+    rRic_m = numpy.einsum('tij,ntj->nti', Q, rEci_m - rChief_m)
+    vRic_mps = numpy.einsum('tij,ntj->nti', Q, vEci_mps - vChief_mps)
+    w_radps = numpy.sum(numpy.cross(rChief_m, vChief_mps)**2, axis=-1)**0.5 / numpy.sum(rChief_m**2, axis=-1)
+    vRic_mps[...,0] += w_radps * rRic_m[...,1]
+    vRic_mps[...,1] -= w_radps * rRic_m[...,0]
+    return rRic_m, vRic_mps
+
+def propagateCw(x0Ric, n_radps, dt_s):
+    """Propagates (N,6) RIC relative states (position in meters, velocity in
+       meters per second) by the Clohessy-Wiltshire solution for a circular
+       chief of the given mean motion over the given (T,) elapsed times
+       (seconds), returning (N,T,3) position and velocity arrays.
+    """
+    x0Ric = numpy.atleast_2d(x0Ric)[:,numpy.newaxis,:]
+    x, y, z, vx, vy, vz = [x0Ric[...,k] for k in range(6)]
+    nt = n_radps * numpy.asarray(dt_s, dtype=float)[numpy.newaxis,:]
+    s, c = numpy.sin(nt), numpy.cos(nt)
+    n = n_radps
+    rRic_m = numpy.stack((
+        (4 - 3 * c) * x + s / n * vx + 2 / n * (1 - c) * vy,
+        6 * (s - nt) * x + y - 2 / n * (1 - c) * vx + (4 * s - 3 * nt) / n * vy,
+        c * z + s / n * vz), axis=-1)
+    vRic_mps = numpy.stack((
+        3 * n * s * x + c * vx + 2 * s * vy,
+        6 * n * (c - 1) * x - 2 * s * vx + (4 * c - 3) * vy,
+        -n * s * z + c * vz), axis=-1)
+    return rRic_m, vRic_mps
+
+def getRic(chief, deputies, t_s, isCw=False):
+    """Returns (N,T,3) position (meters) and velocity (meters per second) arrays
+       of each deputy (a Population, or a single Orbit) relative to the chief
+       (an Orbit, or the first member of a Population) in the chief's RIC frame
+       at the given (T,) times (seconds since J2000). If *isCw* is set, only
+       the states at the first time are transformed, and the rest follow from
+       the Clohessy-Wiltshire solution with the chief's mean motion.
+    """
+    chief, deputies = _population(chief), _population(deputies)
+    t_s = numpy.atleast_1d(numpy.asarray(t_s, dtype=float))
+    if isCw:
+        rChief_m, vChief_mps = chief.getRVeci(t_s[:1])
+        rEci_m, vEci_mps = deputies.getRVeci(t_s[:1])
+        rRic_m, vRic_mps = eci2ric(rChief_m[0], vChief_mps[0], rEci_m, vEci_mps)
+        x0Ric = numpy.hstack((rRic_m[:,0,:], vRic_mps[:,0,:]))
+        return propagateCw(x0Ric, chief.getMeanMotion()[0], t_s - t_s[0])
+    rChief_m, vChief_mps = chief.getRVeci(t_s)
+    rEci_m, vEci_mps = deputies.getRVeci(t_s)
+    return eci2ric(rChief_m[0], vChief_mps[0], rEci_m, vEci_mps)
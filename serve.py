@@ -0,0 +1,291 @@
+"""Defines an asyncio propagation service that keeps a population in memory and
+   answers "where is object X at time T" queries over HTTP, on a TCP port or a
+   Unix socket. Queries arriving within a short window are coalesced into one
+   vectorized propagation, evaluated in an executor so the event loop stays
+   responsive. A stand-in client is included for load testing:
+
+       python -m oyb.serve catalog.tle --port 8080
+       python -m oyb.serve catalog.tle --unix /tmp/oyb.sock
+       python -m oyb.serve catalog.tle --load 10000 --concurrency 64
+
+   Queries take the form "GET /r?name=<name>&t=<ISO 8601>&frame=<eci|ecf|lla>"
+   and return JSON; "GET /stats" reports batching and latency percentiles.
+"""
+
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import datetime
+import collections
+import numpy
+from urllib.parse import urlsplit, parse_qs, quote_plus
+from oyb import batch, earth
+
+frames = ('eci', 'ecf', 'lla')
+
+class Batcher(object):
+    """Coalesces concurrent queries into vectorized population evaluations
+    """
+
+    def __init__(self, pop, window_s=2e-3, maxBatch=4096, executor=None, nLatencies=100000):
+        """Initializes a batcher for the given Population. Queries are held for
+           up to *window_s* seconds (or until *maxBatch* are pending) before the
+           batch is evaluated in the given executor (the loop default if None).
+        """
+        self.pop = pop
+        self.window_s = window_s
+        self.maxBatch = maxBatch
+        self.executor = executor
+        self.ndxByName = dict((name, ndx) for ndx, name in enumerate(pop.names))
+        self.pending = []
+        self.handle = None
+        self.nQueries = 0
+        self.nBatches = 0
+        self.latencies_s = collections.deque(maxlen=nLatencies)
+
+    def getIndex(self, name):
+        """Returns the population index of the named object, or raises a
+           KeyError if the name is not in the catalog.
+        """
+        return self.ndxByName[name]
+
+    async def query(self, ndx, t_s, frame='lla'):
+        """Returns the 3-component position of the object at the given index
+           and time (seconds since J2000) in the given frame, once the batch
+           containing this query has been evaluated.
+        """
+        if frame not in frames:
+            raise ValueError('Unsupported frame "%s"' % frame)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((ndx, t_s, frame, future, time.perf_counter()))
+        if len(self.pending) >= self.maxBatch:
+            self.flush()
+        elif self.handle is None:
+            self.handle = loop.call_later(self.window_s, self.flush)
+        return await future
+
+    def flush(self):
+        """Dispatches all pending queries as a single batch to the executor.
+        """
+        if self.handle is not None:
+            self.handle.cancel()
+            self.handle = None
+        if len(self.pending) == 0:
+            return
+        queries, self.pending = self.pending, []
+        self.nBatches += 1
+        self.nQueries += len(queries)
+        ndx = numpy.array([q[0] for q in queries], dtype=int)
+        t_s = numpy.array([q[1] for q in queries], dtype=float)
+        loop = asyncio.get_running_loop()
+        job = loop.run_in_executor(self.executor, evaluate, self.pop, ndx, t_s)
+        job.add_done_callback(lambda j: self.resolve(queries, j))
+
+    def resolve(self, queries, job):
+        """Distributes the results of an evaluated batch to the futures of the
+           queries it contained, recording the latency of each.
+        """
+        if job.exception() is not None:
+            for q in queries:
+                if not q[3].done():
+                    q[3].set_exception(job.exception())
+            return
+        results = job.result()
+        tNow = time.perf_counter()
+        for ndx, q in enumerate(queries):
+            if not q[3].done():
+                q[3].set_result(results[q[2]][ndx])
+            self.latencies_s.append(tNow - q[4])
+
+    def getStats(self):
+        """Returns a dictionary of query and batch counts, the mean batch size,
+           and latency percentiles (in milliseconds) of recent queries.
+        """
+        stats = {
+            'queries': self.nQueries,
+            'batches': self.nBatches,
+            'meanBatch': self.nQueries / self.nBatches if self.nBatches > 0 else 0,
+        }
+        stats.update(getPercentiles(self.latencies_s))
+        return stats
+
+def evaluate(pop, ndx, t_s):
+    """Evaluates one time per object for the given population indices in a
+       single vectorized pass, returning a dictionary of (K,3) arrays keyed by
+       frame name.
+    """
+    sub = pop.subset(ndx)
+    t_s = t_s.reshape(-1, 1)
+    rEci_m = sub.getReci(t_s)
+    rEcf_m = earth.eci2ecf(rEci_m, t_s)
+    rLla_radm = batch.ecf2sph(rEcf_m)
+    return {'eci': rEci_m[:,0,:], 'ecf': rEcf_m[:,0,:], 'lla': rLla_radm[:,0,:]}
+
+def getPercentiles(latencies_s, pcts=(50, 90, 99, 99.9)):
+    """Returns a dictionary of the given latency percentiles (and maximum), in
+       milliseconds, from a sequence of latencies in seconds.
+    """
+    if len(latencies_s) == 0:
+        return {}
+    lat_ms = 1e3 * numpy.array(latencies_s)
+    stats = dict(('p%g_ms' % p, float(v)) for p, v in zip(pcts, numpy.percentile(lat_ms, pcts)))
+    stats['max_ms'] = float(lat_ms.max())
+    return stats
+
+async def respond(writer, status, body):
+    """Writes an HTTP/1.1 response with the given status and JSON body.
+    """
+    content = json.dumps(body).encode('utf-8')
+    reasons = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 500: 'Internal Server Error'}
+    head = 'HTTP/1.1 %u %s\r\nContent-Type: application/json\r\nContent-Length: %u\r\n\r\n' % (status, reasons[status], len(content))
+    writer.write(head.encode('ascii') + content)
+    await writer.drain()
+
+async def handle(batcher, reader, writer):
+    """Serves HTTP requests on one (keep-alive) client connection until it is
+       closed by the client. Malformed queries are answered with status 400,
+       and failed evaluations with status 500.
+    """
+    try:
+        while True:
+            line = await reader.readline()
+            if len(line) == 0:
+                break
+            isClose = False
+            while True:
+                header = await reader.readline()
+                if header in (b'\r\n', b'\n', b''):
+                    break
+                if header.lower().startswith(b'connection:') and b'close' in header.lower():
+                    isClose = True
+            parts = line.decode('ascii', 'replace').split()
+            url = urlsplit(parts[1] if len(parts) > 1 else '')
+            params = dict((k, v[0]) for k, v in parse_qs(url.query).items())
+            if url.path == '/stats':
+                await respond(writer, 200, batcher.getStats())
+            elif url.path == '/r':
+                if 'name' not in params:
+                    await respond(writer, 400, {'error': 'Missing object name'})
+                    continue
+                try:
+                    ndx = batcher.getIndex(params['name'])
+                except KeyError:
+                    await respond(writer, 404, {'error': 'Unknown object "%s"' % params['name']})
+                    continue
+                try:
+                    t_dt = earth.parseTime(params['t']) if 't' in params else datetime.datetime.utcnow()
+                    frame = params.get('frame', 'lla')
+                    t_s = earth.dt2sec(t_dt)
+                except (ValueError, TypeError, OverflowError) as e:
+                    await respond(writer, 400, {'error': str(e)})
+                    continue
+                try:
+                    r = await batcher.query(ndx, t_s, frame)
+                except ValueError as e:
+                    await respond(writer, 400, {'error': str(e)})
+                    continue
+                except Exception as e:
+                    await respond(writer, 500, {'error': '%s: %s' % (type(e).__name__, e)})
+                    continue
+                await respond(writer, 200, {'name': params['name'], 't': t_dt.isoformat(), 'frame': frame, 'r': r.tolist()})
+            else:
+                await respond(writer, 404, {'error': 'Unknown path "%s"' % url.path})
+            if isClose:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def start(batcher, host='127.0.0.1', port=8080, unixPath=None):
+    """Starts (and returns) an asyncio server answering queries with the given
+       batcher, on a Unix socket if a path is given and TCP otherwise.
+    """
+    cb = lambda reader, writer: handle(batcher, reader, writer)
+    if unixPath is not None:
+        return await asyncio.start_unix_server(cb, path=unixPath)
+    return await asyncio.start_server(cb, host=host, port=port)
+
+async def connect(host='127.0.0.1', port=8080, unixPath=None):
+    """Opens a client connection to a running service.
+    """
+    if unixPath is not None:
+        return await asyncio.open_unix_connection(unixPath)
+    return await asyncio.open_connection(host, port)
+
+async def get(reader, writer, path):
+    """Issues one GET request on an open (keep-alive) connection and returns
+       the status code and decoded JSON body.
+    """
+    writer.write(('GET %s HTTP/1.1\r\nHost: oyb\r\n\r\n' % path).encode('ascii'))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        header = await reader.readline()
+        if header in (b'\r\n', b'\n', b''):
+            break
+        if header.lower().startswith(b'content-length:'):
+            length = int(header.split(b':')[1])
+    return status, json.loads(await reader.readexactly(length))
+
+async def loadTest(names, t0_dt, T_s, nRequests=1000, nConcurrent=32, host='127.0.0.1', port=8080, unixPath=None, frame='lla'):
+    """Stand-in client that issues *nRequests* queries for random objects and
+       times (within *T_s* seconds of the given datetime) over *nConcurrent*
+       keep-alive connections. Returns client-side latency percentiles (in
+       milliseconds) and throughput.
+    """
+    latencies_s = []
+    counts = [nRequests // nConcurrent + (1 if n < nRequests % nConcurrent else 0) for n in range(nConcurrent)]
+    async def worker(count):
+        reader, writer = await connect(host, port, unixPath)
+        for _ in range(count):
+            t_dt = t0_dt + datetime.timedelta(seconds=random.uniform(0, T_s))
+            path = '/r?name=%s&t=%s&frame=%s' % (quote_plus(random.choice(names)), t_dt.isoformat(), frame)
+            tStart = time.perf_counter()
+            await get(reader, writer, path)
+            latencies_s.append(time.perf_counter() - tStart)
+        writer.close()
+        await writer.wait_closed()
+    tStart = time.perf_counter()
+    await asyncio.gather(*[worker(c) for c in counts if c > 0])
+    dt_s = time.perf_counter() - tStart
+    stats = {'requests': nRequests, 'seconds': dt_s, 'perSecond': nRequests / dt_s}
+    stats.update(getPercentiles(latencies_s))
+    return stats
+
+async def main(args):
+    """Loads the catalog and runs the service (and, if requested, a load test
+       against it) until interrupted.
+    """
+    with open(args.catalog, 'r') as f:
+        pop = batch.Population.fromTle(f.read(), isJ2=args.j2)
+    batcher = Batcher(pop, window_s=1e-3 * args.window)
+    server = await start(batcher, args.host, args.port, args.unix)
+    port = server.sockets[0].getsockname()[1] if args.unix is None else args.port
+    print('Serving %u objects on %s' % (len(pop), args.unix or '%s:%u' % (args.host, port)), file=sys.stderr)
+    if args.load is None:
+        async with server:
+            await server.serve_forever()
+    else:
+        t0_dt = earth.sec2dt(numpy.median(pop.tEpoch_s))
+        client = await loadTest(pop.names, t0_dt, 86400, args.load, args.concurrency, args.host, port, args.unix)
+        server.close()
+        await server.wait_closed()
+        print(json.dumps({'client': client, 'server': batcher.getStats()}, indent=4))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog='python -m oyb.serve', description='Serves position queries against a TLE catalog.')
+    parser.add_argument('catalog', help='path to TLE catalog (with or without title lines)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--unix', default=None, help='serve on this Unix socket path instead of TCP')
+    parser.add_argument('--j2', action='store_true', help='propagate with mean J2 precession')
+    parser.add_argument('--window', type=float, default=2.0, help='batching window, in milliseconds')
+    parser.add_argument('--load', type=int, default=None, help='run a load test of this many requests, then exit')
+    parser.add_argument('--concurrency', type=int, default=32, help='load test client connections')
+    asyncio.run(main(parser.parse_args()))
@@ -17,9 +17,23 @@ else:
 
 __all__ = [
     'anomaly',
+    'batch',
+    'cache',
+    'cli',
+    'cowell',
     'earth',
+    'eclipse',
+    'ephem',
+    'events',
+    'history',
+    'lambert',
+    'links',
+    'occupancy',
     'orb',
-    'rot'
+    'relative',
+    'rot',
+    'serve',
+    'walker'
 ]
 
 def suite():
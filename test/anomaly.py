@@ -2,6 +2,7 @@
 """
 
 import unittest
+import numpy
 from math import pi
 import oyb
 from oyb import anomaly, earth
@@ -25,5 +26,45 @@ class MeanToTrue(unittest.TestCase):
         M_rad = anomaly.true2mean(193.2 * pi / 180, 0.37255)
         self.assertTrue(abs((M_rad % (2 * pi)) - 3.6029) < 1e-1)
         
+class SolverTests(unittest.TestCase):
+    def setUp(self):
+        self.M_rad = numpy.linspace(-2 * pi, 4 * pi, 3001)
+        self.e = 0.7125849
+
+    def test_strategies(self):
+        for starter in anomaly.starters:
+            for method in anomaly.methods:
+                E_rad = anomaly.mean2ecc(self.M_rad, self.e, starter, method, 1e-12)
+                self.assertTrue(numpy.max(numpy.abs(anomaly.ecc2mean(E_rad, self.e) - self.M_rad)) < 1e-11)
+
+    def test_starters(self):
+        M_rad = numpy.concatenate((pi * numpy.linspace(0, 1, 1001)**3, numpy.logspace(-10, -3, 51)))
+        M_rad = numpy.concatenate((-M_rad, M_rad))
+        e = numpy.concatenate((numpy.linspace(0, 0.999, 101), 1 - numpy.logspace(-3, -9, 31)))
+        Mi_rad, ei = numpy.meshgrid(M_rad, e, indexing='ij')
+        E_rad = anomaly.solveKepler(Mi_rad, ei, 'cubic', 'danby', 1e-12)[0]
+        bounds = {'cubic': [4e-3] * 4, 'markley': [5e-4] * 4, 'table': [1e-4, 3e-4, 5e-4, 2e-3]}
+        for starter, bound in bounds.items():
+            dE_rad = numpy.abs(anomaly.starters[starter](Mi_rad, ei) - E_rad)
+            for eMax, b in zip((0.9, 0.99, 0.999, 1), bound):
+                self.assertTrue(numpy.max(dE_rad[ei < eMax]) < b)
+
+    def test_iterations(self):
+        _, nBasic = anomaly.solveKepler(self.M_rad, self.e, 'basic', 'newton', 1e-10)
+        _, nMarkley = anomaly.solveKepler(self.M_rad, self.e, 'markley', 'halley', 1e-10)
+        self.assertTrue(nMarkley < nBasic)
+
+    def test_scalar(self):
+        E_rad = anomaly.mean2ecc(3.6029, 0.37255, 'markley', 'danby')
+        self.assertTrue(isinstance(E_rad, float))
+        self.assertTrue(abs(E_rad - anomaly.mean2ecc(3.6029, 0.37255)) < 1e-8)
+
+    def test_unwrapped(self):
+        E_rad = numpy.linspace(-3 * pi, 5 * pi, 1001)
+        tht_rad = anomaly.ecc2trueUnwrapped(E_rad, 0.8)
+        self.assertTrue(numpy.all(numpy.diff(tht_rad) > 0))
+        self.assertTrue(numpy.allclose(numpy.cos(tht_rad), numpy.cos(anomaly.ecc2true(E_rad, 0.8))))
+        self.assertTrue(numpy.allclose(anomaly.true2eccUnwrapped(tht_rad, 0.8), E_rad))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,110 @@
+"""
+"""
+
+import datetime
+import unittest
+import tracemalloc
+import numpy
+from math import pi
+import oyb
+from oyb import batch, data, earth
+
+def getTle():
+    with open(data.get_path('test.tle'), 'r') as f:
+        return f.read()
+
+class PopulationTests(unittest.TestCase):
+    def setUp(self):
+        self.orbits = [
+            oyb.Orbit(a_m=1.064e7, e=0.42607, i_rad=39.687*pi/180, O_rad=130.32*pi/180, w_rad=42.373*pi/180, M_rad=4.2866),
+            oyb.MeanJ2(a_m=6.718e6, e=8.931e-3, i_rad=51.43*pi/180, O_rad=1.0, w_rad=2.0, M_rad=3.0),
+            oyb.MeanJ2.fromMolniya(0.5)]
+        self.orbits[2].M_rad = 0.1
+        self.pop = batch.Population.fromOrbits(self.orbits)
+        self.t_dt = self.orbits[0].tEpoch_dt + datetime.timedelta(1.3)
+
+    def test_reci(self):
+        rEci_m = self.pop.getReci(earth.dt2sec(self.t_dt))
+        for ndx, o in enumerate(self.orbits):
+            dr_m = rEci_m[ndx] - o.getReci(self.t_dt)
+            self.assertTrue(dr_m.dot(dr_m)**0.5 < 1e-3)
+
+    def test_rlla(self):
+        rLla_radm = self.pop.getRlla(earth.dt2sec(self.t_dt))
+        for ndx, o in enumerate(self.orbits):
+            self.assertTrue(numpy.allclose(rLla_radm[ndx], o.getRlla(self.t_dt), rtol=1e-9))
+
+    def test_geodetic(self):
+        t_s = earth.dt2sec(self.t_dt)
+        rLla_radm = self.pop.getRlla(t_s, isGeodetic=True)
+        for ndx, o in enumerate(self.orbits):
+            self.assertTrue(numpy.allclose(rLla_radm[ndx], o.getRlla(self.t_dt, isGeodetic=True), rtol=1e-9))
+            rEcf_m = earth.getQeci2ecf(self.t_dt).dot(o.getReci(self.t_dt))
+            self.assertTrue(numpy.allclose(earth.lla2ecf(rLla_radm[ndx]), rEcf_m, rtol=0, atol=1e-3))
+        aer = self.pop.getAer([[0.5, 1.0, 0]], numpy.array([t_s, t_s + 60]))
+        self.assertEqual(aer.shape, (1, len(self.pop), 2, 3))
+
+    def test_veci(self):
+        t_s = earth.dt2sec(self.t_dt) + numpy.array([-0.5, 0.5])
+        rEci_m, vEci_mps = self.pop.subset([0]).getRVeci(t_s)
+        dv_mps = (rEci_m[0,1] - rEci_m[0,0]) - 0.5 * (vEci_mps[0,0] + vEci_mps[0,1])
+        self.assertTrue(dv_mps.dot(dv_mps)**0.5 < 1e-2)
+
+    def test_propagate(self):
+        rEci_m = self.pop.propagate(self.t_dt, 3600, 7)
+        self.assertEqual(rEci_m.shape, (3, 7, 3))
+        rEnd_m = self.orbits[1].getReci(self.t_dt + datetime.timedelta(seconds=3600))
+        self.assertTrue(numpy.allclose(rEci_m[1,-1], rEnd_m, rtol=1e-9))
+
+    def test_pointwise(self):
+        t_s = earth.dt2sec(self.t_dt) + numpy.array([[0.0], [60.0], [120.0]])
+        rEci_m = self.pop.getReci(t_s)
+        self.assertEqual(rEci_m.shape, (3, 1, 3))
+        rRef_m = self.orbits[2].getReci(self.t_dt + datetime.timedelta(seconds=120))
+        self.assertTrue(numpy.allclose(rEci_m[2,0], rRef_m, rtol=1e-9))
+
+    def test_float32(self):
+        t_s = earth.dt2sec(self.t_dt) + numpy.arange(0, 86400, 60.0)
+        for frame in ('eci', 'ecf'):
+            r64_m = self.pop.getPosition(t_s, frame)
+            r32_m = self.pop.getPosition(t_s, frame, numpy.float32)
+            self.assertEqual(r32_m.dtype, numpy.float32)
+            radius_m = numpy.sum(r64_m**2, axis=-1, keepdims=True)**0.5
+            self.assertTrue(numpy.all(numpy.abs(r32_m - r64_m) <= 3e-7 * radius_m))
+        _, v64_mps = self.pop.getRVeci(t_s)
+        _, v32_mps = self.pop.getRVeci(t_s, numpy.float32)
+        speed_mps = numpy.sum(v64_mps**2, axis=-1, keepdims=True)**0.5
+        self.assertTrue(numpy.all(numpy.abs(v32_mps - v64_mps) <= 3e-7 * speed_mps))
+        tracemalloc.start()
+        r32_m, v32_mps = self.pop.getRVeci(t_s, numpy.float32)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.assertTrue(peak < 6 * (r32_m.nbytes + v32_mps.nbytes))
+        rLla64_radm = self.pop.getPosition(t_s, 'lla')
+        rLla32_radm = self.pop.getPosition(t_s, 'lla', numpy.float32)
+        self.assertTrue(numpy.all(numpy.abs(rLla32_radm - rLla64_radm)[...,:2] <= 5e-7))
+        self.assertTrue(numpy.all(numpy.abs(rLla32_radm - rLla64_radm)[...,2] <= 4e-7 * radius_m[...,0]))
+
+    def test_roundtrip(self):
+        orbits = self.pop.subset([2, 0]).toOrbits()
+        self.assertTrue(isinstance(orbits[0], oyb.MeanJ2))
+        self.assertFalse(isinstance(orbits[1], oyb.MeanJ2))
+        self.assertTrue(abs(orbits[1].a_m - self.orbits[0].a_m) < 1e-6)
+
+class TleTests(unittest.TestCase):
+    def test_fromTle(self):
+        pop = batch.Population.fromTle(getTle())
+        lines = getTle().splitlines()
+        o = oyb.Orbit.fromTle(lines[1], lines[2])
+        self.assertEqual(pop.names, ['COSMOS 2510'])
+        self.assertTrue(abs(pop.e[0] - o.e) < 1e-12)
+        self.assertTrue(abs(earth.sec2dt(pop.tEpoch_s[0]) - o.tEpoch_dt).total_seconds() < 1e-3)
+
+    def test_untitled(self):
+        lines = getTle().splitlines()
+        pop = batch.Population.fromTle('\n'.join(lines[1:] + lines[1:]), isJ2=True)
+        self.assertEqual(pop.names, ['41032', '41032'])
+        self.assertTrue(all(pop.isJ2))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+"""
+
+import shutil
+import tempfile
+import unittest
+import numpy
+from oyb import batch, cache
+
+def getPopulation(n=20):
+    ndx = numpy.arange(n)
+    return batch.Population(7e6 + 1e4 * ndx, e=0.001 * ndx, i_rad=0.9, O_rad=0.1 * ndx, M_rad=0.3 * ndx, tEpoch_s=6e8, isJ2=ndx % 2 == 0)
+
+class KeyTests(unittest.TestCase):
+    def test_stable(self):
+        pop = getPopulation()
+        t_s = 6e8 + numpy.arange(0, 3600, 60.0)
+        keys = cache.getKeys(pop, t_s)
+        self.assertEqual(keys, cache.getKeys(getPopulation(), t_s.copy()))
+        self.assertEqual(len(set(keys)), len(pop))
+        self.assertNotEqual(keys, cache.getKeys(pop, t_s, 'ecf'))
+        self.assertNotEqual(keys, cache.getKeys(pop, t_s, dtype=numpy.float32))
+        self.assertNotEqual(keys[0], cache.getKeys(pop, t_s + 1)[0])
+        pop.isJ2[0] = False
+        self.assertNotEqual(keys[0], cache.getKeys(pop, t_s)[0])
+        self.assertEqual(keys[1:], cache.getKeys(pop, t_s)[1:])
+
+class CacheTests(unittest.TestCase):
+    def setUp(self):
+        self.pop = getPopulation()
+        self.t_s = 6e8 + numpy.arange(0, 3600, 60.0)
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_refresh(self):
+        c = cache.Cache()
+        r_m = c.propagate(self.pop, self.t_s, 'ecf')
+        self.assertTrue(numpy.all(r_m == self.pop.getRecf(self.t_s)))
+        self.pop.M_rad[3] += 0.1
+        r_m = c.propagate(self.pop, self.t_s, 'ecf')
+        self.assertTrue(numpy.all(r_m == self.pop.getRecf(self.t_s)))
+        stats = c.getStats()
+        self.assertEqual((stats['hits'], stats['misses']), (19, 21))
+        self.assertEqual(stats['entries'], 21)
+
+    def test_float32(self):
+        c = cache.Cache()
+        r_m = c.propagate(self.pop, self.t_s)
+        r32_m = c.propagate(self.pop, self.t_s, dtype=numpy.float32)
+        self.assertEqual(r32_m.dtype, numpy.float32)
+        self.assertEqual(c.getStats()['misses'], 40)
+        self.assertTrue(numpy.all(r32_m == self.pop.getReci(self.t_s, numpy.float32)))
+        self.assertTrue(numpy.all(c.propagate(self.pop, self.t_s) == r_m))
+        self.assertEqual(c.propagate(self.pop, self.t_s, dtype=numpy.float32).dtype, numpy.float32)
+        self.assertEqual(c.getStats()['hits'], 40)
+
+    def test_memory(self):
+        nBytes = self.t_s.shape[0] * 3 * 8
+        c = cache.Cache(maxBytes=5 * nBytes)
+        c.propagate(self.pop, self.t_s)
+        self.assertEqual(len(c), 5)
+        self.assertTrue(c.getStats()['bytes'] <= 5 * nBytes)
+        self.assertEqual(c.getStats()['evictions'], 15)
+        c.propagate(self.pop.subset([19, 18]), self.t_s)
+        self.assertEqual(c.getStats()['hits'], 2)
+
+    def test_disk(self):
+        c = cache.Cache(maxBytes=0, path=self.path)
+        r_m = c.propagate(self.pop, self.t_s)
+        self.assertEqual(len(c), 0)
+        c = cache.Cache(path=self.path)
+        self.assertEqual(c.getStats()['diskEntries'], 20)
+        self.assertTrue(numpy.all(c.propagate(self.pop, self.t_s) == r_m))
+        self.assertEqual(c.getStats()['diskHits'], 20)
+        c = cache.Cache(path=self.path, maxDiskBytes=c.getStats()['diskBytes'] // 2)
+        self.assertEqual(c.getStats()['diskEntries'], 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+"""
+
+import io
+import os
+import shutil
+import contextlib
+import datetime
+import tempfile
+import unittest
+import numpy
+from oyb import batch, cli, data, earth, ephem
+
+class PropagateTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        with open(data.get_path('test.tle'), 'r') as f:
+            lines = f.read().splitlines()
+        self.catalog = os.path.join(self.dir, 'catalog.tle')
+        with open(self.catalog, 'w') as f:
+            for n in range(5):
+                f.write('OBJECT %u\n%s\n%s\n' % (n, lines[1], lines[2]))
+        self.pop = batch.Population.fromTle('\n'.join(lines), isJ2=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def run_cli(self, *args):
+        output = os.path.join(self.dir, 'out.bin')
+        cli.main(['propagate', self.catalog, '-o', output, '--span', '600', '--step', '60', '--model', 'MeanJ2', '--chunk', '2', '--quiet'] + list(args))
+        return ephem.readBin(output)
+
+    def test_serial(self):
+        names, t_s, frame, r = self.run_cli('--frame', 'lla')
+        self.assertEqual(names, ['OBJECT %u' % n for n in range(5)])
+        self.assertEqual(r.shape, (5, 11, 3))
+        self.assertTrue(numpy.allclose(r[4], self.pop.getRlla(t_s)[0], rtol=1e-12))
+
+    def test_workers(self):
+        names, t_s, frame, r = self.run_cli('--workers', '2')
+        self.assertEqual(frame, 'eci')
+        self.assertTrue(numpy.allclose(r[3], self.pop.getReci(t_s)[0], rtol=1e-12))
+
+    def test_float32(self):
+        names, t_s, frame, r = self.run_cli('--dtype', 'float32')
+        self.assertEqual(r.dtype, numpy.float32)
+        rEci_m = self.pop.getReci(t_s)[0]
+        self.assertTrue(numpy.all(numpy.abs(r[2] - rEci_m) <= 3e-7 * numpy.sum(rEci_m**2, axis=-1, keepdims=True)**0.5))
+
+    def test_start(self):
+        names, t_s, frame, r = self.run_cli('--start', '2016-11-08T01:00:00+01:00')
+        self.assertEqual(t_s[0], earth.dt2sec(datetime.datetime(2016, 11, 8)))
+        names, t_s, frame, r = self.run_cli('--start', '2016-11-08T00:00:00Z')
+        self.assertEqual(t_s[0], earth.dt2sec(datetime.datetime(2016, 11, 8)))
+
+    def test_invalid(self):
+        for args in (('--step', '0'), ('--chunk', '0'), ('--workers', '-1'), ('--span', '-60'), ('--start', 'yesterday')):
+            with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+                self.run_cli(*args)
+
+if __name__ == '__main__':
+    unittest.main()
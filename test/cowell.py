@@ -0,0 +1,60 @@
+"""
+"""
+
+import datetime
+import unittest
+import numpy
+from math import pi
+import oyb
+from oyb import batch, cowell, earth
+
+class CowellTests(unittest.TestCase):
+    def setUp(self):
+        t_dt = datetime.datetime(2020, 1, 1)
+        self.orbits = [
+            oyb.Orbit(a_m=7e6, e=0.01, i_rad=0.9, O_rad=0.5, w_rad=0.3, M_rad=0.7, tEpoch_dt=t_dt),
+            oyb.Orbit(a_m=1.064e7, e=0.42607, i_rad=39.687*pi/180, O_rad=130.32*pi/180, w_rad=42.373*pi/180, M_rad=4.2866, tEpoch_dt=t_dt)]
+        self.pop = batch.Population.fromOrbits(self.orbits)
+        self.t0_s = earth.dt2sec(t_dt)
+        self.t_s = self.t0_s + numpy.arange(0, 6 * 3600 + 1, 300.0)
+
+    def test_twobody(self):
+        c = cowell.Cowell.fromOrbits(self.orbits, isJ2=False)
+        rEci_m, vEci_mps = c.propagate(self.t_s)
+        rRef_m, vRef_mps = self.pop.getRVeci(self.t_s)
+        self.assertTrue(numpy.max(numpy.abs(rEci_m - rRef_m)) < 1)
+        self.assertTrue(numpy.max(numpy.abs(vEci_mps - vRef_mps)) < 1e-3)
+        self.assertEqual(c.t_s, self.t_s[-1])
+
+    def test_continue(self):
+        c = cowell.Cowell.fromPopulation(self.pop, self.t0_s)
+        rAll_m, _ = c.propagate(self.t_s)
+        c = cowell.Cowell.fromPopulation(self.pop, self.t0_s)
+        rHead_m, _ = c.propagate(self.t_s[:10])
+        rTail_m, _ = c.propagate(self.t_s[10:])
+        self.assertTrue(numpy.max(numpy.abs(numpy.concatenate((rHead_m, rTail_m), axis=1) - rAll_m)) < 1)
+        self.assertRaises(ValueError, c.propagate, self.t_s[:1])
+
+    def test_j2(self):
+        pop = batch.Population.fromOrbits([oyb.MeanJ2(a_m=6.718e6, e=8.931e-3, i_rad=51.43*pi/180, tEpoch_dt=self.orbits[0].tEpoch_dt)])
+        c = cowell.Cowell.fromPopulation(pop, self.t0_s)
+        rEci_m, vEci_mps = c.propagate(self.t0_s + 86400 * numpy.array([0, 2.0]))
+        hEci_m2ps = numpy.cross(rEci_m[0], vEci_mps[0])
+        O_rad = numpy.arctan2(hEci_m2ps[:,0], -hEci_m2ps[:,1])
+        dRaan_radps = (O_rad[1] - O_rad[0]) / (2 * 86400)
+        self.assertTrue(abs(dRaan_radps - pop.getRaanRate()[0]) / abs(dRaan_radps) < 1e-2)
+
+    def test_maneuver(self):
+        c = cowell.Cowell.fromOrbits(self.orbits[:1], isJ2=False)
+        c.propagate([self.t0_s + 600])
+        rEci_m, vEci_mps = c.getRVeci()
+        dv_mps = 50 * vEci_mps[0] / numpy.sum(vEci_mps[0]**2)**0.5
+        c.applyDeltaV(dv_mps)
+        o = c.toOrbits()[0]
+        self.assertTrue(o.a_m > self.orbits[0].a_m + 5e4)
+        rNew_m, _ = c.propagate([self.t0_s + 3600])
+        rRef_m = o.getReci(o.tEpoch_dt + datetime.timedelta(seconds=3000))
+        self.assertTrue(numpy.sum((rNew_m[0,0] - rRef_m)**2)**0.5 < 1)
+
+if __name__ == '__main__':
+    unittest.main()
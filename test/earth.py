@@ -26,5 +26,65 @@ class TopoTests(unittest.TestCase):
         self.assertTrue(err_pct < 1e-3)
         lst_rad = gmst_rad + rSiteLla_radm[1]
 
+class GeodeticTests(unittest.TestCase):
+    def setUp(self):
+        lat, lon, alt = numpy.meshgrid(numpy.linspace(-pi / 2, pi / 2, 37), numpy.linspace(-pi, pi, 13, endpoint=False), [-1e3, 0, 4e5, 3.6e7], indexing='ij')
+        self.rLla_radm = numpy.stack((lat, lon, alt), axis=-1)
+
+    def test_lla2eci(self):
+        t_dt = datetime.datetime(2016, 11, 2, 5, 39, 5)
+        rEcf_m = earth.lla2ecf(self.rLla_radm)
+        rEci_m = earth.lla2eci(self.rLla_radm[20,3,2], t_dt)
+        self.assertTrue(numpy.allclose(earth.getQeci2ecf(t_dt).dot(rEci_m), rEcf_m[20,3,2], rtol=0, atol=1e-6))
+
+    def test_roundtrip(self):
+        rLla_radm = earth.ecf2lla(earth.lla2ecf(self.rLla_radm))
+        self.assertEqual(rLla_radm.shape, self.rLla_radm.shape)
+        self.assertTrue(numpy.max(numpy.abs(rLla_radm[...,0] - self.rLla_radm[...,0])) < 1e-12)
+        self.assertTrue(numpy.max(numpy.abs(rLla_radm[...,2] - self.rLla_radm[...,2])) < 1e-6)
+        isPole = numpy.abs(numpy.abs(self.rLla_radm[...,0]) - pi / 2) < 1e-9
+        dLon_rad = (rLla_radm[...,1] - self.rLla_radm[...,1] + pi) % (2 * pi) - pi
+        self.assertTrue(numpy.max(numpy.abs(dLon_rad[~isPole])) < 1e-12)
+
+class LookTests(unittest.TestCase):
+    def test_enu(self):
+        sites = numpy.array([[20 * pi / 180, 60 * pi / 180, 0], [-0.6, -2.0, 1e3]])
+        Q = earth.getQecf2enuArray(sites)
+        for m in range(sites.shape[0]):
+            self.assertTrue(numpy.allclose(Q[m], earth.getQecf2enu(sites[m]), rtol=0, atol=1e-15))
+
+    def test_aer(self):
+        sites = numpy.array([[0.7, -1.3, 100], [-0.2, 2.5, 0]])
+        rUp_m = earth.lla2ecf(sites + [0, 0, 5e5])
+        rNorth_m = earth.lla2ecf(sites + [1e-3, 0, 0])
+        rEast_m = earth.lla2ecf(sites + [0, 1e-3, 0])
+        rEcf_m = numpy.stack((rUp_m, rNorth_m, rEast_m), axis=1)
+        aer = earth.ecf2aer(rEcf_m, sites)
+        self.assertEqual(aer.shape, (2, 2, 3, 3))
+        for m in range(2):
+            self.assertTrue(abs(aer[m,m,0,1] - pi / 2) < 1e-9)
+            self.assertTrue(abs(aer[m,m,0,2] - 5e5) < 1e-6)
+            self.assertTrue(min(aer[m,m,1,0], 2 * pi - aer[m,m,1,0]) < 1e-6)
+            self.assertTrue(abs(aer[m,m,2,0] - pi / 2) < 1e-3)
+            self.assertTrue(abs(aer[m,m,1,1]) < 1e-3)
+
+class SunTests(unittest.TestCase):
+    def test_equinox(self):
+        rSun_m = earth.getSunEci(earth.dt2sec(datetime.datetime(2000, 3, 20, 7, 35, 0)))
+        r_m = rSun_m.dot(rSun_m)**0.5
+        self.assertTrue(abs(r_m - earth.au_m) / r_m < 1e-2)
+        self.assertTrue(abs(rSun_m[0] / r_m - 1) < 1e-6)
+
+    def test_solstice(self):
+        rSun_m = earth.getSunEci(earth.dt2sec(datetime.datetime(2000, 6, 21, 1, 48, 0)))
+        dec_rad = numpy.arcsin(rSun_m[2] / rSun_m.dot(rSun_m)**0.5)
+        self.assertTrue(abs(dec_rad - 23.439 * pi / 180) < 1e-3)
+
+    def test_vectorized(self):
+        t_s = 86400 * numpy.arange(4)
+        rSun_m = earth.getSunEci(t_s)
+        self.assertEqual(rSun_m.shape, (4, 3))
+        self.assertTrue(numpy.allclose(rSun_m[2], earth.getSunEci(t_s[2])))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,58 @@
+"""
+"""
+
+import datetime
+import unittest
+import numpy
+from math import pi, asin
+import oyb
+from oyb import batch, earth, eclipse
+
+class ShadowTests(unittest.TestCase):
+    def setUp(self):
+        self.rSun_m = numpy.array([earth.au_m, 0, 0])
+
+    def test_states(self):
+        rEci_m = numpy.array([[7e6, 0, 0], [-7e6, 0, 0], [0, 7e6, 0], [-7e6, 6.36e6, 0]])
+        for model in eclipse.models:
+            flags = eclipse.getShadow(rEci_m, self.rSun_m, model)
+            self.assertEqual(list(flags[:3]), [eclipse.sunlit, eclipse.umbra, eclipse.sunlit])
+        self.assertEqual(eclipse.getShadow(rEci_m[3], self.rSun_m, 'conical'), eclipse.penumbra)
+        self.assertEqual(eclipse.getShadow(rEci_m[3], self.rSun_m, 'cylindrical'), eclipse.umbra)
+
+    def test_model(self):
+        self.assertRaises(ValueError, eclipse.getShadow, numpy.zeros(3), self.rSun_m, 'spherical')
+
+class EclipseTests(unittest.TestCase):
+    def setUp(self):
+        t0_dt = datetime.datetime(2000, 3, 20, 7, 35, 0)
+        self.o = oyb.Orbit(a_m=7e6, e=0, i_rad=0, O_rad=0, w_rad=0, M_rad=0, tEpoch_dt=t0_dt)
+        self.pop = batch.Population.fromOrbits([self.o, self.o])
+        self.t_s = earth.dt2sec(t0_dt) + numpy.arange(0, 86400, 30.0)
+
+    def test_duration(self):
+        dt_s = self.o.getPeriod() * asin(earth.eqRad_m / self.o.a_m) / pi
+        ndx, tEnter_s, tExit_s = eclipse.getEclipses(self.pop, self.t_s, 'cylindrical', nChunk=500)
+        self.assertTrue(numpy.all(numpy.abs(tExit_s[1:-1] - tEnter_s[1:-1] - dt_s) < 5))
+        self.assertEqual(list(ndx), sorted(ndx))
+
+    def test_regions(self):
+        ndx, tPen_s, tPenExit_s = eclipse.getEclipses(self.pop, self.t_s, 'conical', eclipse.penumbra)
+        _, tUmb_s, tUmbExit_s = eclipse.getEclipses(self.pop, self.t_s, 'conical', eclipse.umbra)
+        self.assertTrue(numpy.all(tPen_s[1:] < tUmb_s[1:]))
+        self.assertTrue(numpy.all(tPenExit_s[:-1] > tUmbExit_s[:-1]))
+
+    def test_chunks(self):
+        a = eclipse.getEclipses(self.pop, self.t_s, nChunk=7)
+        b = eclipse.getEclipses(self.pop, self.t_s, nChunk=100000)
+        for x, y in zip(a, b):
+            self.assertTrue(numpy.allclose(x, y))
+
+    def test_states(self):
+        flags = eclipse.getStates(self.pop, self.t_s[:200])
+        ndx, tEnter_s, tExit_s = eclipse.getEclipses(self.pop, self.t_s[:200])
+        inside = (self.t_s[:200] > tEnter_s[0]) & (self.t_s[:200] < tExit_s[0])
+        self.assertTrue(numpy.array_equal(flags[0] > 0, inside))
+
+if __name__ == '__main__':
+    unittest.main()
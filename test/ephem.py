@@ -0,0 +1,61 @@
+"""
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy
+from oyb import ephem
+
+class WriterTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.names = ['A', 'B', 'C']
+        self.t_s = 5e8 + 60 * numpy.arange(4)
+        self.r = numpy.random.RandomState(0).normal(size=(3, 4, 3)) * 7e6
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, ext, dtype=float):
+        path = os.path.join(self.dir, 'out.' + ext)
+        with ephem.getWriter(path, self.names, self.t_s, 'ecf', dtype=dtype) as w:
+            w.write(self.r[:2])
+            w.write(self.r[2:])
+        return path
+
+    def test_bin(self):
+        names, t_s, frame, r = ephem.readBin(self.write('bin'))
+        self.assertEqual(names, self.names)
+        self.assertEqual(frame, 'ecf')
+        self.assertTrue(numpy.allclose(t_s, self.t_s))
+        self.assertTrue(numpy.array_equal(r, self.r))
+
+    def test_float32(self):
+        r32 = self.r.astype(numpy.float32)
+        names, t_s, frame, r = ephem.readBin(self.write('bin', numpy.float32))
+        self.assertEqual(r.dtype, numpy.float32)
+        self.assertTrue(numpy.array_equal(r, r32))
+        r = numpy.load(self.write('npy', numpy.float32))
+        self.assertEqual(r.dtype, numpy.float32)
+        self.assertTrue(numpy.array_equal(r, r32))
+        with self.assertRaises(ValueError):
+            self.write('bin', numpy.float16)
+
+    def test_npy(self):
+        self.assertTrue(numpy.array_equal(numpy.load(self.write('npy')), self.r))
+
+    def test_csv(self):
+        with open(self.write('csv'), 'r') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 1 + 3 * 4)
+        row = lines[-1].split(',')
+        self.assertEqual(row[0], 'C')
+        self.assertTrue(numpy.allclose([float(v) for v in row[2:]], self.r[2,3]))
+
+    def test_format(self):
+        self.assertRaises(ValueError, ephem.getWriter, os.path.join(self.dir, 'out.txt'), self.names, self.t_s)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+"""
+
+import datetime
+import unittest
+import numpy
+from math import pi
+import oyb
+from oyb import batch, data, earth, events
+
+class EventTests(unittest.TestCase):
+    def setUp(self):
+        with open(data.get_path('test.tle'), 'r') as f:
+            lines = f.read().splitlines()
+        molniya = oyb.MeanJ2.fromMolniya(0.3)
+        molniya.M_rad = 1.0
+        self.orbits = [
+            oyb.MeanJ2.fromTle(lines[1], lines[2]),
+            molniya,
+            oyb.Orbit(a_m=7e6, e=0.1, i_rad=1.0, O_rad=1.0, w_rad=2.0, M_rad=3.0, tEpoch_dt=datetime.datetime(2016, 11, 7))]
+        self.pop = batch.Population.fromOrbits(self.orbits)
+        self.tStart_s = earth.dt2sec(datetime.datetime(2016, 11, 10))
+        self.tStop_s = self.tStart_s + 10 * 86400
+
+    def test_counts(self):
+        table = events.getEvents(self.pop, self.tStart_s, self.tStop_s, isStates=False)
+        T_s = self.pop.getPeriod()
+        TNode_s = 2 * pi / (self.pop.getMeanMotion() + self.pop.getAopRate())
+        for ndx in range(len(self.pop)):
+            for kind in range(4):
+                n = numpy.sum((table['ndx'] == ndx) & (table['kind'] == kind))
+                self.assertTrue(abs(n - 10 * 86400 / (T_s if kind in (events.perigee, events.apogee) else TNode_s)[ndx]) <= 1)
+        self.assertTrue(numpy.all(numpy.diff(table['t_s'][table['ndx'] == 1]) > 0))
+
+    def test_apsides(self):
+        table = events.getEvents(self.pop, self.tStart_s, self.tStop_s, kinds=(events.perigee, events.apogee))
+        rMag_m = numpy.sum(table['rEci_m']**2, axis=1)**0.5
+        vr_mps = numpy.sum(table['rEci_m'] * table['vEci_mps'], axis=1) / rMag_m
+        self.assertTrue(numpy.all(numpy.abs(vr_mps) < 1e-3))
+        rPer_m = self.pop.a_m * (1 - self.pop.e)
+        isPer = table['kind'] == events.perigee
+        self.assertTrue(numpy.allclose(rMag_m[isPer], rPer_m[table['ndx'][isPer]], rtol=1e-9))
+
+    def test_nodes(self):
+        table = events.getEvents(self.pop, self.tStart_s, self.tStop_s, kinds=(events.ascNode, events.descNode))
+        rMag_m = numpy.sum(table['rEci_m']**2, axis=1)**0.5
+        self.assertTrue(numpy.all(numpy.abs(table['rEci_m'][:,2]) / rMag_m < 1e-9))
+        vz_mps = table['vEci_mps'][:,2]
+        self.assertTrue(numpy.all(vz_mps[table['kind'] == events.ascNode] > 0))
+        self.assertTrue(numpy.all(vz_mps[table['kind'] == events.descNode] < 0))
+
+    def test_drift(self):
+        pop = batch.Population.fromOrbits([oyb.MeanJ2(a_m=6.9e6, e=0.01, i_rad=0.1), oyb.MeanJ2(a_m=6.78e6, e=5e-4, i_rad=51.6*pi/180)])
+        tStart_s = pop.tEpoch_s[0]
+        tStop_s = tStart_s + 150 * 86400
+        self.assertTrue(numpy.all(numpy.abs(pop.getAopRate()) * (tStop_s - tStart_s) > 2 * pi))
+        TNode_s = 2 * pi / (pop.getMeanMotion() + pop.getAopRate())
+        for kind in (events.ascNode, events.descNode):
+            objs, t_s = events.getTimes(pop, kind, tStart_s, tStop_s)
+            for ndx in range(len(pop)):
+                dt_s = numpy.diff(t_s[objs == ndx])
+                self.assertTrue(numpy.all(numpy.abs(dt_s - TNode_s[ndx]) < 1e-3 * TNode_s[ndx]))
+                self.assertTrue(t_s[objs == ndx][0] - tStart_s < TNode_s[ndx])
+                self.assertTrue(tStop_s - t_s[objs == ndx][-1] < TNode_s[ndx])
+
+    def test_orbit(self):
+        t_dt = self.orbits[2].tEpoch_dt
+        table = events.getEvents(self.orbits[2], t_dt, t_dt + datetime.timedelta(1))
+        self.assertTrue(numpy.all(table['ndx'] == 0))
+        isPer = table['kind'] == events.perigee
+        tPer_dt = earth.sec2dt(table['t_s'][isPer][0])
+        self.assertTrue(abs(getAnomalyAt(self.orbits[2], tPer_dt)) < 1e-6)
+
+def getAnomalyAt(o, t_dt):
+    tht_rad = o.getTrue(t_dt)
+    return (tht_rad + pi) % (2 * pi) - pi
+
+if __name__ == '__main__':
+    unittest.main()
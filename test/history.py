@@ -0,0 +1,124 @@
+"""
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy
+import oyb
+from oyb import data, earth, history
+
+def getTle():
+    with open(data.get_path('test.tle'), 'r') as f:
+        return f.read()
+
+def getHistory(ids, days):
+    """Returns TLE text with element sets of the test object, renumbered with
+       each of the given catalog numbers, at each of the given days of 2016.
+    """
+    _, line1, line2 = getTle().splitlines()[:3]
+    lines = []
+    for id in ids:
+        for d in days:
+            lines.append(line1[:2] + '%05u' % id + line1[7:20] + '%012.8f' % d + line1[32:])
+            lines.append(line2[:2] + '%05u' % id + line2[7:])
+    return '\n'.join(lines)
+
+class ParseTests(unittest.TestCase):
+    def test_orbit(self):
+        _, line1, line2 = getTle().splitlines()[:3]
+        o = oyb.Orbit.fromTle(line1, line2)
+        d = history.parseTle(getTle())
+        self.assertEqual(d['id'].tolist(), [41032])
+        self.assertTrue(abs(d['tEpoch_s'][0] - earth.dt2sec(o.tEpoch_dt)) < 1e-3)
+        for c in ('a_m', 'e', 'i_rad', 'O_rad', 'w_rad', 'M_rad'):
+            self.assertTrue(abs(d[c][0] - getattr(o, c)) <= 1e-12 * abs(getattr(o, c)))
+
+    def test_alpha5(self):
+        _, line1, line2 = getTle().splitlines()[:3]
+        text = '\n'.join((line1[:2] + 'A0001' + line1[7:], line2[:2] + 'A0001' + line2[7:], line1[:2] + 'Z9999' + line1[7:], line2[:2] + 'Z9999' + line2[7:]))
+        self.assertEqual(history.parseTle(text)['id'].tolist(), [100001, 339999])
+        with self.assertRaises(ValueError):
+            history.parseTle(text.replace('A0001', 'I0001'))
+
+class HistoryTests(unittest.TestCase):
+    def setUp(self):
+        self.days = numpy.arange(100.5, 200.5, 0.75)
+        self.store = history.TleHistory()
+        self.store.ingest(getHistory([25544, 41032, 7], self.days[::-1]))
+        self.t0_s = self.store.data['tEpoch_s'][self.store.getRange(7)][0]
+
+    def test_sorted(self):
+        self.assertEqual(len(self.store), 3 * self.days.shape[0])
+        self.assertEqual(self.store.ids.tolist(), [7, 25544, 41032])
+        t_s = self.store.data['tEpoch_s'][self.store.getRange(41032)]
+        self.assertTrue(numpy.all(numpy.diff(t_s) > 0))
+
+    def test_nearest(self):
+        t_s = self.t0_s + numpy.linspace(-86400, 110 * 86400, 1000)
+        rows = self.store.selectNearest(25544, t_s)
+        tEpoch_s = self.store.data['tEpoch_s']
+        start, stop = self.store.ranges[25544]
+        brute = start + numpy.argmin(numpy.abs(tEpoch_s[start:stop][numpy.newaxis,:] - t_s[:,numpy.newaxis]), axis=1)
+        self.assertTrue(numpy.all(numpy.abs(tEpoch_s[rows] - t_s) == numpy.abs(tEpoch_s[brute] - t_s)))
+        self.assertEqual([self.store.getNearest(25544, t) for t in t_s], rows.tolist())
+        self.assertEqual(self.store.selectNearest([1, 7], self.t0_s)[0], -1)
+
+    def test_range(self):
+        rows = self.store.getRange(7, self.t0_s + 86400, self.t0_s + 10 * 86400)
+        t_s = self.store.data['tEpoch_s'][rows]
+        self.assertEqual(t_s.shape[0], 12)
+        self.assertTrue(t_s[0] >= self.t0_s + 86400 and t_s[-1] <= self.t0_s + 10 * 86400)
+        self.assertEqual(self.store.getRange(1).stop - self.store.getRange(1).start, 0)
+
+    def test_duplicates(self):
+        n = len(self.store)
+        self.store.ingest(getHistory([7], [100.5, 300.5]))
+        self.assertEqual(len(self.store), n + 1)
+
+    def test_incremental(self):
+        store = history.TleHistory()
+        batches = [getHistory([7, 25544], [150.5, 100.5]), getHistory([8, 7], [120.5, 150.5, 99.5]), getHistory([1, 25544], [300.5])]
+        for text in batches:
+            store.ingest(text)
+        expected = history.TleHistory()
+        expected.merge(history._concat([history.parseTle(text) for text in batches]))
+        for c in history.columns:
+            self.assertTrue(numpy.array_equal(store.data[c], expected.data[c]))
+        self.assertEqual(store.ids.tolist(), [1, 7, 8, 25544])
+        self.assertEqual(store.ranges[7], (1, 5))
+
+    def test_outputs(self):
+        rows = self.store.getRange(41032)
+        pop = self.store.getPopulation(rows, isJ2=True)
+        orbits = self.store.getOrbits(rows)
+        self.assertEqual(len(pop), len(orbits))
+        self.assertEqual(pop.names[0], '41032')
+        self.assertTrue(isinstance(pop.toOrbits()[0], oyb.MeanJ2))
+        self.assertTrue(abs(earth.dt2sec(orbits[0].tEpoch_dt) - pop.tEpoch_s[0]) < 1e-3)
+
+class PersistenceTests(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_append(self):
+        store = history.TleHistory(self.path)
+        store.ingest(getHistory([7, 8], [10.5, 12.5]))
+        store.ingest(getHistory([7], [11.5]))
+        loaded = history.TleHistory(self.path)
+        self.assertEqual(len(loaded), 5)
+        self.assertEqual(loaded.getRange(7).stop - loaded.getRange(7).start, 3)
+        store.save()
+        self.assertEqual(len([f for f in os.listdir(self.path) if f.startswith('segment')]), 0)
+        store.ingest(getHistory([9], [1.5]))
+        loaded = history.TleHistory(self.path)
+        self.assertEqual(loaded.ids.tolist(), [7, 8, 9])
+        for c in history.columns:
+            self.assertTrue(numpy.all(numpy.asarray(loaded.data[c]) == store.data[c]))
+
+if __name__ == '__main__':
+    unittest.main()
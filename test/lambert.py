@@ -0,0 +1,72 @@
+"""
+"""
+
+import datetime
+import unittest
+import numpy
+import oyb
+from oyb import batch, earth, lambert
+
+class SolverTests(unittest.TestCase):
+    def test_example5p2(self):
+        v1_mps, v2_mps = lambert.solve(numpy.array([5e6, 1e7, 2.1e6]), numpy.array([-1.46e7, 2.5e6, 7e6]), 3600)
+        self.assertTrue(numpy.allclose(v1_mps, [-5.9925e3, 1.9254e3, 3.2456e3], rtol=1e-4))
+        self.assertTrue(numpy.allclose(v2_mps, [-3.3125e3, -4.1966e3, -3.8529e2], rtol=1e-4))
+
+    def test_roundtrip(self):
+        o = oyb.Orbit(a_m=1.064e7, e=0.42607, i_rad=0.69, O_rad=2.27, w_rad=0.74, M_rad=4.2866, tEpoch_dt=datetime.datetime(2020, 1, 1))
+        pop = batch.Population.fromOrbits([o])
+        t_s = earth.dt2sec(o.tEpoch_dt) + numpy.array([0, 1000, 3000, 9000])
+        rEci_m, vEci_mps = pop.getRVeci(t_s)
+        v1_mps, v2_mps = lambert.solve(rEci_m[0,0], rEci_m[0,1:], t_s[1:] - t_s[0])
+        self.assertTrue(numpy.max(numpy.abs(v1_mps - vEci_mps[0,0])) < 1e-6)
+        self.assertTrue(numpy.max(numpy.abs(v2_mps - vEci_mps[0,1:])) < 1e-6)
+
+    def test_retrograde(self):
+        r1_m, r2_m = numpy.array([7e6, 0, 0]), numpy.array([0, 8e6, 0])
+        vPro_mps, _ = lambert.solve(r1_m, r2_m, 2000, True)
+        vRet_mps, _ = lambert.solve(r1_m, r2_m, 2000, False)
+        self.assertTrue(numpy.cross(r1_m, vPro_mps)[2] > 0)
+        self.assertTrue(numpy.cross(r1_m, vRet_mps)[2] < 0)
+
+    def test_invalid(self):
+        v1_mps, _ = lambert.solve(numpy.array([7e6, 0, 0]), numpy.array([[0, 8e6, 0], [-8e6, 0, 0]]), [-10, 3000])
+        self.assertTrue(numpy.all(numpy.isnan(v1_mps)))
+
+class PorkchopTests(unittest.TestCase):
+    def test_grid(self):
+        t_dt = datetime.datetime(2020, 1, 1)
+        chaser = oyb.Orbit(a_m=7e6, e=0.001, i_rad=0.5, O_rad=0.1, w_rad=0, M_rad=0, tEpoch_dt=t_dt)
+        target = oyb.Orbit(a_m=7.5e6, e=0.01, i_rad=0.5, O_rad=0.1, w_rad=0, M_rad=2.0, tEpoch_dt=t_dt)
+        t0_s = earth.dt2sec(t_dt)
+        tDep_s = t0_s + numpy.linspace(0, 6000, 40)
+        tArr_s = t0_s + numpy.linspace(1000, 9000, 50)
+        grid = lambert.porkchop(chaser, target, tDep_s, tArr_s, None)
+        self.assertEqual(grid['dv_mps'].shape, (40, 50))
+        self.assertTrue(numpy.all(numpy.isnan(grid['dv_mps'][grid['dt_s'] <= 0])))
+        r1_m, v1_mps = batch.Population.fromOrbits([chaser]).getRVeci(tDep_s[5])
+        r2_m, v2_mps = batch.Population.fromOrbits([target]).getRVeci(tArr_s[20])
+        v1L_mps, v2L_mps = lambert.solve(r1_m[0], r2_m[0], tArr_s[20] - tDep_s[5])
+        dv_mps = numpy.sum((v1L_mps - v1_mps[0])**2)**0.5 + numpy.sum((v2_mps[0] - v2L_mps)**2)**0.5
+        self.assertTrue(abs(grid['dv_mps'][5,20] - dv_mps) < 1e-6)
+
+    def test_single(self):
+        o = oyb.Orbit(a_m=8e6, e=0.1, i_rad=0.5, O_rad=0.1, w_rad=0.2, M_rad=0.3, tEpoch_dt=datetime.datetime(2020, 1, 1))
+        pop = batch.Population.fromOrbits([o, o])
+        t0_s = earth.dt2sec(o.tEpoch_dt)
+        with self.assertRaises(ValueError):
+            lambert.porkchop(pop, o, [t0_s], [t0_s + 600])
+        with self.assertRaises(ValueError):
+            lambert.porkchop(o, pop.subset([]), [t0_s], [t0_s + 600])
+        grid = lambert.porkchop(pop.subset([1]), o, [t0_s], [t0_s + 600])
+        self.assertEqual(grid['dv_mps'].shape, (1, 1))
+
+    def test_coast(self):
+        o = oyb.Orbit(a_m=8e6, e=0.1, i_rad=0.5, O_rad=0.1, w_rad=0.2, M_rad=0.3, tEpoch_dt=datetime.datetime(2020, 1, 1))
+        t0_s = earth.dt2sec(o.tEpoch_dt)
+        T_s = o.getPeriod()
+        grid = lambert.porkchop(o, o, t0_s + numpy.linspace(0, 0.2 * T_s, 20), t0_s + numpy.linspace(0.25 * T_s, 0.45 * T_s, 30))
+        self.assertTrue(numpy.nanmax(grid['dv_mps']) < 1e-3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+"""
+
+import unittest
+import numpy
+from oyb import earth, links, walker
+
+class OcclusionTests(unittest.TestCase):
+    def test_clear(self):
+        r1_m = numpy.array([[7e6, 0, 0], [7e6, 0, 0], [7e6, 0, 0], [7e6, 0, 0]])
+        r2_m = numpy.array([[-7e6, 0, 0], [7e6, 1e6, 0], [7e6 * numpy.cos(0.5), 7e6 * numpy.sin(0.5), 0], [0, 7e6, 0]])
+        self.assertEqual(links.isClear(r1_m, r2_m).tolist(), [False, True, True, False])
+        self.assertFalse(links.isClear(r1_m[2], r2_m[2], 6.9e6))
+
+class GraphTests(unittest.TestCase):
+    def setUp(self):
+        self.pop, _ = walker.getSweep([(66, 6, 2, 7.8e5, 1.4), (40, 5, 1, 1.2e6, 0.9)], tEpoch_s=0)
+        self.t_s = numpy.arange(0, 3000, 100.0)
+
+    def test_candidates(self):
+        rEci_m = self.pop.getReci(0.0)
+        a, b = numpy.triu_indices(len(self.pop), 1)
+        isNear = numpy.sum((rEci_m[a] - rEci_m[b])**2, axis=1) <= 3e6**2
+        counts = []
+        for cell_m, reach in ((3e6, 1), (1.5e6, 2), (1e6, 3)):
+            i, j = links.getCandidates(rEci_m, cell_m, reach=reach)
+            pairs = set(zip(numpy.minimum(i, j).tolist(), numpy.maximum(i, j).tolist()))
+            self.assertEqual(len(pairs), i.shape[0])
+            self.assertTrue(set(zip(a[isNear].tolist(), b[isNear].tolist())) <= pairs)
+            counts.append(i.shape[0])
+        self.assertTrue(counts[0] < a.shape[0])
+        self.assertTrue(counts[2] < counts[1] < counts[0])
+
+    def test_bruteForce(self):
+        graph = links.getLinks(self.pop, self.t_s, 4e6, nPoints=1000)
+        self.assertEqual(graph['indptr'].shape, (self.t_s.shape[0] + 1,))
+        rEci_m, vEci_mps = self.pop.getRVeci(self.t_s)
+        a, b = numpy.triu_indices(len(self.pop), 1)
+        for k in range(self.t_s.shape[0]):
+            dr_m = rEci_m[b,k] - rEci_m[a,k]
+            range_m = numpy.sum(dr_m**2, axis=1)**0.5
+            isLink = (range_m <= 4e6) & links.isClear(rEci_m[a,k], rEci_m[b,k], earth.eqRad_m + 1e5)
+            step = links.getStep(graph, k)
+            self.assertEqual(step['i'].tolist(), a[isLink].tolist())
+            self.assertEqual(step['j'].tolist(), b[isLink].tolist())
+            self.assertTrue(numpy.allclose(step['range_m'], range_m[isLink]))
+            rangeRate_mps = numpy.sum(dr_m * (vEci_mps[b,k] - vEci_mps[a,k]), axis=1)[isLink] / range_m[isLink]
+            self.assertTrue(numpy.allclose(step['rangeRate_mps'], rangeRate_mps))
+
+    def test_blocks(self):
+        graph = links.getLinks(self.pop, self.t_s, 4e6)
+        blocks = list(links.iterLinks(self.pop, self.t_s, 4e6, nSteps=7))
+        self.assertEqual([k0 for k0, _ in blocks], [0, 7, 14, 21, 28])
+        self.assertEqual(sum(b['i'].shape[0] for _, b in blocks), graph['i'].shape[0])
+        k0, block = blocks[2]
+        self.assertEqual(links.getStep(block, 3)['j'].tolist(), links.getStep(graph, k0 + 3)['j'].tolist())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+"""
+
+import unittest
+import numpy
+from math import pi
+from oyb import batch, earth, occupancy
+
+class OccupancyTests(unittest.TestCase):
+    def setUp(self):
+        self.pop = batch.Population([earth.eqRad_m + 5.5e5, earth.eqRad_m + 8e5, 2.6e7], e=[0, 0.01, 0.74],
+            i_rad=[0.9, 1.7, 1.1], O_rad=[0, 1, 2], w_rad=[0, 1, 4.7], M_rad=[0, 2, 3], tEpoch_s=0)
+        self.altEdges_m = numpy.concatenate((numpy.arange(0, 2e6, 1e5), numpy.arange(2e6, 4.2e7, 1e6)))
+
+    def test_cdf(self):
+        rp_m, ra_m = self.pop.getShape()
+        cdf = occupancy.getRadialCdf(self.pop, earth.eqRad_m + numpy.array([0, 5.5e5, 5.6e5, 5e7]))
+        self.assertTrue(numpy.allclose(cdf[:,0], 0) and numpy.allclose(cdf[:,-1], 1))
+        self.assertEqual(cdf[0,1:3].tolist(), [1, 1])
+        t_s = numpy.linspace(0, self.pop.getPeriod()[2], 200001)[:-1]
+        r_m = numpy.sum(self.pop.subset([2]).getReci(t_s)[0]**2, axis=1)**0.5
+        r0_m = numpy.linspace(rp_m[2], ra_m[2], 7) + earth.eqRad_m
+        sampled = numpy.mean(r_m[:,numpy.newaxis] <= r0_m, axis=0)
+        self.assertTrue(numpy.max(numpy.abs(occupancy.getRadialCdf(self.pop.subset([2]), r0_m)[0] - sampled)) < 1e-4)
+
+    def test_sparse(self):
+        r_m = earth.eqRad_m + self.altEdges_m
+        objs, shells, fractions = occupancy.getShellFractions(self.pop, r_m)
+        dense = numpy.zeros((len(self.pop), r_m.shape[0] - 1))
+        numpy.add.at(dense, (objs, shells), fractions)
+        self.assertTrue(numpy.allclose(dense, numpy.diff(occupancy.getRadialCdf(self.pop, r_m), axis=1), rtol=0, atol=1e-12))
+        self.assertTrue(numpy.sum(objs == 2) < r_m.shape[0] - 1)
+
+    def test_occupancy(self):
+        occ = occupancy.getOccupancy(self.pop, self.altEdges_m, [0, pi / 3, 2 * pi / 3, pi])
+        self.assertEqual(occ.shape, (self.altEdges_m.shape[0] - 1, 3))
+        self.assertTrue(numpy.allclose(numpy.sum(occ, axis=0), [1, 2, 0]))
+        self.assertTrue(abs(occ[5,0] - 1) < 1e-12)
+        counts = occupancy.getCounts(self.pop, self.altEdges_m, [0, pi / 3, 2 * pi / 3, pi])
+        self.assertEqual(counts[5,0], 1)
+        self.assertEqual(numpy.sum(counts), 3)
+
+    def test_density(self):
+        rho = occupancy.getDensity(self.pop, self.altEdges_m)
+        r_m = earth.eqRad_m + self.altEdges_m[5:7]
+        occ = occupancy.getOccupancy(self.pop, self.altEdges_m)
+        self.assertTrue(occ[5,0] > 1)
+        self.assertTrue(abs(rho[5,0] * 4 / 3 * pi * (r_m[1]**3 - r_m[0]**3) / occ[5,0] - 1) < 1e-12)
+
+    def test_snapshot(self):
+        H, edges = occupancy.getSnapshot(self.pop, 1000.0, bins=8)
+        self.assertEqual(H.shape, (8, 8, 8))
+        self.assertEqual(numpy.sum(H), 3)
+        self.assertRaises(ValueError, occupancy.getSnapshot, self.pop, 0.0, 8, None, 'lla')
+
+if __name__ == '__main__':
+    unittest.main()
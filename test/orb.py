@@ -112,5 +112,49 @@ class PropertyTests(unittest.TestCase):
         rTaa_m = self.o.getTaaRad()
         self.assertTrue(abs(rTaa_m - 8.387e6) / rTaa_m < 1e-3)
 
+class SamplingTests(unittest.TestCase):
+    def setUp(self):
+        self.o = oyb.Orbit(a_m=2.6e7, e=0.74, i_rad=1.1, O_rad=0.3, w_rad=4.7, M_rad=2.0, tEpoch_dt=datetime.datetime(2020, 1, 1))
+
+    def getDeviation(self, ti_s):
+        dev_m = 0
+        for k in range(ti_s.shape[0] - 1):
+            r = [self.o.getReci(self.o.tEpoch_dt + datetime.timedelta(seconds=t_s)) for t_s in numpy.linspace(ti_s[k], ti_s[k+1], 9)]
+            c = (r[-1] - r[0]) / numpy.linalg.norm(r[-1] - r[0])
+            d = numpy.array(r) - r[0]
+            dev_m = max(dev_m, numpy.max(numpy.linalg.norm(d - numpy.outer(d.dot(c), c), axis=1)))
+        return dev_m
+
+    def test_anomaly(self):
+        T_s = 1.5 * self.o.getPeriod()
+        for spacing in ('eccentric', 'true'):
+            ti_s = self.o.getSampleTimes(T_s=T_s, nSamples=100, spacing=spacing)
+            self.assertEqual(ti_s.shape[0], 100)
+            self.assertTrue(numpy.all(numpy.diff(ti_s) > 0))
+            self.assertTrue(ti_s[0] == 0 and ti_s[-1] == T_s)
+        E_rad = [anomaly.mean2ecc((self.o.M_rad + 2 * pi * t_s / self.o.getPeriod()) % (2 * pi), self.o.e) for t_s in self.o.getSampleTimes(nSamples=5, spacing='eccentric')]
+        self.assertTrue(numpy.allclose(numpy.diff(numpy.unwrap(E_rad)), 2 * pi / 4))
+
+    def test_chord(self):
+        ti_s = self.o.getSampleTimes(spacing='chord', tol_m=1e3)
+        self.assertTrue(self.getDeviation(ti_s) <= 1e3)
+        uniform_s = self.o.getSampleTimes(nSamples=ti_s.shape[0])
+        self.assertTrue(self.getDeviation(uniform_s) > 10e3)
+        rEci_m = self.o.propagate(spacing='chord', tol_m=1e3)
+        self.assertEqual(rEci_m.shape, (ti_s.shape[0], 3))
+        self.assertRaises(ValueError, self.o.getSampleTimes, spacing='chord')
+
+    def test_times(self):
+        t_dt = self.o.tEpoch_dt + datetime.timedelta(0.1)
+        for spacing in ('true', 'chord'):
+            rEci_m = self.o.propagate(t_dt, nSamples=50, spacing=spacing, tol_m=1e3)
+            rLla_radm = self.o.track(t_dt, nSamples=50, spacing=spacing, tol_m=1e3)
+            ti_s = self.o.getSampleTimes(t_dt, nSamples=50, spacing=spacing, tol_m=1e3)
+            self.assertEqual(rEci_m.shape, (ti_s.shape[0], 3))
+            for i in (0, ti_s.shape[0] // 3, ti_s.shape[0] - 1):
+                ti_dt = t_dt + datetime.timedelta(ti_s[i] / 86400)
+                self.assertTrue(numpy.allclose(rEci_m[i], self.o.getReci(ti_dt)))
+                self.assertTrue(numpy.allclose(rLla_radm[i], self.o.getRlla(ti_dt)))
+
 if __name__ == '__main__':
     unittest.main()
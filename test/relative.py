@@ -0,0 +1,48 @@
+"""
+"""
+
+import datetime
+import unittest
+import numpy
+import oyb
+from oyb import batch, earth, relative
+
+class RicTests(unittest.TestCase):
+    def setUp(self):
+        t_dt = datetime.datetime(2020, 1, 1)
+        self.chief = oyb.Orbit(a_m=7e6, e=0, i_rad=0.9, O_rad=0.2, w_rad=0, M_rad=0, tEpoch_dt=t_dt)
+        self.deputies = batch.Population([7e6, 7e6 + 100, 7e6, 7e6], e=[0, 0, 1e-5, 0], i_rad=[0.9, 0.9, 0.9 + 1e-5, 0.9],
+            O_rad=0.2, M_rad=[1e-5, 0, 0, 0], tEpoch_s=earth.dt2sec(t_dt))
+        self.t_s = earth.dt2sec(t_dt) + numpy.arange(0, 6000, 10.0)
+
+    def test_basis(self):
+        rEci_m, vEci_mps = batch.Population.fromOrbits([self.chief]).getRVeci(self.t_s)
+        Q = relative.getQeci2ric(rEci_m[0], vEci_mps[0])
+        self.assertEqual(Q.shape, (self.t_s.shape[0], 3, 3))
+        self.assertTrue(numpy.allclose(numpy.einsum('tij,tkj->tik', Q, Q), numpy.eye(3)))
+        self.assertTrue(numpy.allclose(numpy.linalg.det(Q), 1))
+
+    def test_offsets(self):
+        rRic_m, vRic_mps = relative.getRic(self.chief, self.deputies, self.t_s)
+        self.assertEqual(rRic_m.shape, (4, self.t_s.shape[0], 3))
+        self.assertTrue(numpy.allclose(rRic_m[0,:,1], 70, atol=1e-3))
+        self.assertTrue(numpy.allclose(rRic_m[1,0], [100, 0, 0], atol=1e-6))
+        self.assertTrue(numpy.allclose(rRic_m[3], 0, atol=1e-6))
+        self.assertTrue(numpy.max(numpy.abs(rRic_m[2,:,2])) > 60)
+        dr_mps = (rRic_m[:,2:] - rRic_m[:,:-2]) / 20
+        self.assertTrue(numpy.max(numpy.abs(dr_mps - vRic_mps[:,1:-1])) < 1e-4)
+
+    def test_cw(self):
+        rRic_m, vRic_mps = relative.getRic(self.chief, self.deputies, self.t_s)
+        rCw_m, vCw_mps = relative.getRic(self.chief, self.deputies, self.t_s, isCw=True)
+        self.assertTrue(numpy.max(numpy.abs(rCw_m - rRic_m)) < 0.1)
+        self.assertTrue(numpy.max(numpy.abs(vCw_mps - vRic_mps)) < 1e-4)
+
+    def test_drift(self):
+        n_radps = (earth.mu_m3ps2 / 7e6**3)**0.5
+        rCw_m, _ = relative.propagateCw([[0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 1, 0]], n_radps, [0, 2 * numpy.pi / n_radps])
+        self.assertTrue(numpy.allclose(rCw_m[0], 0))
+        self.assertTrue(abs(rCw_m[1,1,1] + 3 * 2 * numpy.pi / n_radps) < 1e-6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+"""
+
+import io
+import json
+import asyncio
+import argparse
+import contextlib
+import unittest
+import numpy
+import oyb
+from oyb import batch, data, earth, serve
+
+class BatcherTests(unittest.TestCase):
+    def setUp(self):
+        orbits = [oyb.Orbit(a_m=7e6 + 1e5 * n, e=0.01 * n, i_rad=0.1 * n, O_rad=0.2, w_rad=0.3, M_rad=0.4 * n) for n in range(10)]
+        self.pop = batch.Population.fromOrbits(orbits)
+        self.t_s = earth.dt2sec(orbits[0].tEpoch_dt) + 600 * numpy.arange(50)
+
+    def test_coalesce(self):
+        async def run():
+            batcher = serve.Batcher(self.pop, window_s=5e-2)
+            coros = [batcher.query(n % 10, self.t_s[n], 'eci') for n in range(50)]
+            return batcher, await asyncio.gather(*coros)
+        batcher, results = asyncio.run(run())
+        self.assertTrue(batcher.nBatches < 50)
+        self.assertEqual(batcher.nQueries, 50)
+        for n, r in enumerate(results):
+            self.assertTrue(numpy.allclose(r, self.pop.getReci(self.t_s[n])[n % 10], rtol=1e-12))
+        self.assertTrue('p99_ms' in batcher.getStats())
+
+    def test_http(self):
+        async def run():
+            batcher = serve.Batcher(self.pop)
+            server = await serve.start(batcher, port=0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await serve.connect(port=port)
+            t_dt = earth.sec2dt(self.t_s[3])
+            status, body = await serve.get(reader, writer, '/r?name=3&t=%s&frame=lla' % t_dt.isoformat())
+            missing, _ = await serve.get(reader, writer, '/r?name=missing')
+            utc, utcBody = await serve.get(reader, writer, '/r?name=3&t=%sZ&frame=lla' % t_dt.isoformat())
+            bad, _ = await serve.get(reader, writer, '/r?name=3&t=yesterday')
+            unnamed, _ = await serve.get(reader, writer, '/r?t=%s' % t_dt.isoformat())
+            batcher.pop = None
+            failed, _ = await serve.get(reader, writer, '/r?name=3&t=%s&frame=lla' % t_dt.isoformat())
+            writer.close()
+            await writer.wait_closed()
+            server.close()
+            await server.wait_closed()
+            return status, body, missing, utc, utcBody, bad, unnamed, failed
+        status, body, missing, utc, utcBody, bad, unnamed, failed = asyncio.run(run())
+        self.assertEqual(status, 200)
+        self.assertEqual(missing, 404)
+        self.assertEqual(utc, 200)
+        self.assertEqual(utcBody['r'], body['r'])
+        self.assertEqual(bad, 400)
+        self.assertEqual(unnamed, 400)
+        self.assertEqual(failed, 500)
+        self.assertTrue(numpy.allclose(body['r'], self.pop.getRlla(self.t_s[3])[3], rtol=1e-9))
+
+    def test_load(self):
+        args = argparse.Namespace(catalog=data.get_path('test.tle'), j2=False, window=1.0, host='127.0.0.1', port=0, unix=None, load=20, concurrency=4)
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(io.StringIO()):
+            asyncio.run(serve.main(args))
+        stats = json.loads(out.getvalue())
+        self.assertEqual(stats['client']['requests'], 20)
+        self.assertEqual(stats['server']['queries'], 20)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+"""
+
+import unittest
+import numpy
+from math import pi
+from oyb import earth, walker
+
+class PatternTests(unittest.TestCase):
+    def test_delta(self):
+        O_rad, M_rad = walker.getElements(24, 3, 1)
+        self.assertTrue(numpy.allclose(numpy.unique(O_rad), [0, 2 * pi / 3, 4 * pi / 3]))
+        self.assertTrue(numpy.allclose(M_rad[8:16] - M_rad[:8], 2 * pi / 24))
+        self.assertTrue(numpy.allclose(numpy.diff(M_rad[:8]), 2 * pi / 8))
+
+    def test_star(self):
+        O_rad, _ = walker.getElements(6, 6, 0, 'star')
+        self.assertTrue(numpy.allclose(O_rad, numpy.arange(6) * pi / 6))
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, walker.getElements, 10, 3, 0)
+        self.assertRaises(ValueError, walker.getElements, 12, 3, 3)
+        self.assertRaises(ValueError, walker.getElements, 12, 3, 0, 'rosette')
+
+    def test_sweep(self):
+        pop, groups = walker.getSweep([(6, 2, 1, 5e5, 1.0), (8, 4, 0, 1e6, 0.5)], tEpoch_s=0)
+        self.assertEqual(len(pop), 14)
+        self.assertEqual(groups.tolist(), [0] * 6 + [1] * 8)
+        self.assertEqual(pop.names[6], '8/4/0-0')
+        self.assertTrue(numpy.allclose(pop.getShape()[0][6:], 1e6))
+        self.assertTrue(all(pop.isJ2))
+
+class CoverageTests(unittest.TestCase):
+    def test_visibility(self):
+        pop, groups = walker.getSweep([(6, 2, 1, 5e5, 1.0), (8, 4, 0, 1e6, 0.5)], tEpoch_s=0)
+        targets = numpy.array([[0.3, 0.5, 0], [-0.8, 2.0, 1e3], [1.5, 0, 0]])
+        t_s = numpy.arange(0, 21600, 30.0)
+        minEl_rad = 10 * pi / 180
+        covered = walker.getCoverage(pop, targets, t_s, minEl_rad, groups, nChunk=100)
+        self.assertEqual(covered.shape, (2, 3, t_s.shape[0]))
+        el_rad = earth.ecf2aer(pop.getRecf(t_s), targets)[...,1]
+        expected = numpy.stack((numpy.any(el_rad[:,:6] >= minEl_rad, axis=1), numpy.any(el_rad[:,6:] >= minEl_rad, axis=1)))
+        self.assertTrue(numpy.all(covered == expected))
+        self.assertTrue(numpy.any(covered) and not numpy.all(covered))
+
+    def test_shuffled(self):
+        pop, groups = walker.getSweep([(6, 2, 1, 5e5, 1.0), (8, 4, 0, 1e6, 0.5)], tEpoch_s=0)
+        targets = numpy.array([[0.3, 0.5, 0], [-0.8, 2.0, 1e3], [1.5, 0, 0]])
+        t_s = numpy.arange(0, 21600, 30.0)
+        minEl_rad = 10 * pi / 180
+        covered = walker.getCoverage(pop, targets, t_s, minEl_rad, groups)
+        order = numpy.random.RandomState(0).permutation(len(pop))
+        shuffled = walker.getCoverage(pop.subset(order), targets, t_s, minEl_rad, groups[order])
+        self.assertTrue(numpy.all(shuffled == covered))
+
+    def test_float32(self):
+        pop, groups = walker.getSweep([(24, 3, 1, 1.2e6, 1.0), (48, 6, 1, 5e5, 0.9)], tEpoch_s=0)
+        targets = numpy.array([[la, lo, 0] for la in (-1.0, -0.5, 0, 0.5, 1.0) for lo in (-2.0, 0, 2.0)])
+        t_s = numpy.arange(0, 43200, 30.0)
+        minEl_rad = 10 * pi / 180
+        covered = walker.getCoverage(pop, targets, t_s, minEl_rad, groups)
+        covered32 = walker.getCoverage(pop, targets, t_s, minEl_rad, groups, dtype=numpy.float32)
+        isDiff = covered32 != covered
+        self.assertTrue(numpy.sum(isDiff) <= 1e-4 * covered.size)
+        el_rad = earth.ecf2aer(pop.getRecf(t_s), targets)[...,1]
+        for g in range(2):
+            margin_rad = numpy.min(numpy.abs(el_rad[:,groups == g] - minEl_rad), axis=1)
+            self.assertTrue(numpy.all(margin_rad[isDiff[g]] < 1e-4))
+
+    def test_metrics(self):
+        covered = numpy.array([[1, 1, 0, 0, 1, 0, 1, 1], [0] * 8, [1] * 8], dtype=bool)
+        metrics = walker.getMetrics(covered, 10 * numpy.arange(8.0))
+        self.assertTrue(numpy.allclose(metrics['coverage_pct'], [62.5, 0, 100]))
+        self.assertTrue(numpy.allclose(metrics['maxGap_s'], [20, 80, 0]))
+        self.assertTrue(numpy.allclose(metrics['meanGap_s'], [15, 80, 0]))
+
+    def test_evaluate(self):
+        designs = [(24, 3, 1, 1.2e6, 1.0), (48, 6, 1, 1.2e6, 1.0)]
+        targets = numpy.array([[0.5, 0, 0], [0.5, 1.0, 0]])
+        metrics = walker.evaluate(designs, targets, earth.dt2sec(earth.j2000_dt) + numpy.arange(0, 43200, 60.0), 10 * pi / 180)
+        self.assertEqual(metrics['maxGap_s'].shape, (2, 2))
+        self.assertTrue(numpy.all(metrics['coverage_pct'][1] >= metrics['coverage_pct'][0]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""Defines generators of Walker constellations (delta and star patterns, given as
+   T/P/F: total satellites, equally-spaced planes, and relative phasing) as
+   columnar populations, and vectorized coverage and revisit metrics of
+   whole design sweeps over a set of ground targets.
+"""
+
+import numpy
+from math import pi
+from oyb import batch, earth
+
+patterns = ('delta', 'star')
+
+def getElements(T, P, F, pattern='delta'):
+    """Returns RAAN and mean anomaly arrays (radians) of the T satellites of a
+       Walker T/P/F pattern, ordered by plane. Delta patterns spread the P
+       planes over a full circle of RAAN, and star patterns over half of one.
+    """
+    if pattern not in patterns:
+        raise ValueError('Unsupported Walker pattern "%s"' % pattern)
+    if T <= 0 or P <= 0 or T % P != 0:
+        raise ValueError('Walker satellite count (%u) must be a positive multiple of the plane count (%u)' % (T, P))
+    if F < 0 or F >= P:
+        raise ValueError('Walker phasing factor (%u) must be in [0, %u)' % (F, P))
+    S = T // P
+    p, s = numpy.divmod(numpy.arange(T), S)
+    O_rad = (2 * pi if pattern == 'delta' else pi) * p / P
+    M_rad = (2 * pi * s / S + 2 * pi * F * p / T) % (2 * pi)
+    return O_rad, M_rad
+
+def getWalker(T, P, F, alt_m, i_rad, pattern='delta', tEpoch_s=None, isJ2=True):
+    """Returns a Population of the T circular orbits of a Walker T/P/F pattern
+       at the given altitude (meters) and inclination (radians). Satellites are
+       named "T/P/F-k", for the k-th satellite ordered by plane.
+    """
+    O_rad, M_rad = getElements(T, P, F, pattern)
+    names = ['%u/%u/%u-%u' % (T, P, F, k) for k in range(T)]
+    return batch.Population(numpy.full(T, earth.eqRad_m + alt_m), e=0, i_rad=i_rad, O_rad=O_rad, w_rad=0, M_rad=M_rad, tEpoch_s=tEpoch_s, isJ2=isJ2, names=names)
+
+def getSweep(designs, pattern='delta', tEpoch_s=None, isJ2=True):
+    """Returns a single Population holding every satellite of the given Walker
+       designs (a sequence of (T, P, F, alt_m, i_rad) tuples), along with an
+       array of the design index of each satellite, so that the whole sweep
+       can be propagated and evaluated at once.
+    """
+    pops = [getWalker(T, P, F, alt_m, i_rad, pattern, tEpoch_s, isJ2) for T, P, F, alt_m, i_rad in designs]
+    cat = lambda attr: numpy.concatenate([getattr(p, attr) for p in pops])
+    pop = batch.Population(cat('a_m'), e=cat('e'), i_rad=cat('i_rad'), O_rad=cat('O_rad'),
+        w_rad=cat('w_rad'), M_rad=cat('M_rad'), tEpoch_s=cat('tEpoch_s'), isJ2=cat('isJ2'),
+        names=[n for p in pops for n in p.names])
+    return pop, numpy.repeat(numpy.arange(len(pops)), [len(p) for p in pops])
+
+def getCoverage(pop, rTargetLla_radm, t_s, minEl_rad=0, groups=None, nChunk=360, dtype=float):
+    """Returns a (G,K,T) boolean array flagging whether each of the K given
+       geodetic targets ((K,3) lat/lon/alt) sees at least one satellite of each
+       group above the minimum elevation at each of the T given times (seconds
+       since J2000). Groups are given by an (N,) array of group indices per
+       satellite (e.g., from *getSweep*), in any order, and the leading axis
+       follows the sorted distinct indices; by default all satellites form a
+       single group. Times are evaluated *nChunk* samples at a time, with
+       satellite positions and visibility tests in the given floating-point
+       type; in float32, flags can differ from float64 only for geometry
+       within about 1e-4 radians of the elevation mask.
+    """
+    rTargetLla_radm = numpy.atleast_2d(rTargetLla_radm)
+    rTgt_m = earth.lla2ecf(rTargetLla_radm)
+    up = earth.getQecf2enuArray(rTargetLla_radm)[:,2,:]
+    basis = numpy.hstack((up.T, -2 * rTgt_m.T)).astype(dtype)
+    hTgt_m = numpy.sum(rTgt_m * up, axis=1).astype(dtype)
+    r2Tgt_m2 = numpy.sum(rTgt_m**2, axis=1).astype(dtype)
+    groups = numpy.zeros(len(pop), dtype=int) if groups is None else numpy.asarray(groups)
+    if numpy.any(numpy.diff(groups) < 0):
+        order = numpy.argsort(groups, kind='stable')
+        pop, groups = pop.subset(order), groups[order]
+    starts = numpy.concatenate(([0], numpy.nonzero(numpy.diff(groups))[0] + 1))
+    t_s = numpy.asarray(t_s, dtype=float)
+    K = rTgt_m.shape[0]
+    covered = numpy.empty((starts.shape[0], K, t_s.shape[0]), dtype=bool)
+    sin2El = numpy.sin(minEl_rad)**2
+    for k0 in range(0, t_s.shape[0], nChunk):
+        tc_s = t_s[k0:k0 + nChunk]
+        rEcf_m = pop.getRecf(tc_s, dtype)
+        dots = rEcf_m.reshape(-1, 3).dot(basis).reshape(rEcf_m.shape[:2] + (2 * K,))
+        h_m = dots[...,:K] - hTgt_m
+        d2_m2 = numpy.sum(rEcf_m**2, axis=2)[...,numpy.newaxis] + dots[...,K:] + r2Tgt_m2
+        isVisible = (h_m >= 0) & (h_m**2 >= sin2El * d2_m2) if minEl_rad >= 0 else (h_m >= 0) | (h_m**2 <= sin2El * d2_m2)
+        covered[:,:,k0:k0 + nChunk] = numpy.logical_or.reduceat(isVisible, starts, axis=0).transpose(0, 2, 1)
+    return covered
+
+def getMetrics(covered, t_s):
+    """Returns coverage metrics along the last (time) axis of the given boolean
+       coverage array, as a dictionary of arrays with the shape of the leading
+       axes: 'coverage_pct' (percent of time covered), and 'maxGap_s' and
+       'meanGap_s' (longest and mean duration, in seconds, of the uncovered
+       intervals, or revisit gaps). Each sample stands for the interval
+       between the midpoints to its neighbors; gaps at either end of the grid
+       are clipped to it, and a target that is never uncovered has no gaps.
+    """
+    t_s = numpy.asarray(t_s, dtype=float)
+    covered = numpy.asarray(covered, dtype=bool)
+    shape = covered.shape[:-1]
+    flat = covered.reshape(-1, t_s.shape[0])
+    mid_s = 0.5 * (t_s[1:] + t_s[:-1])
+    edges_s = numpy.concatenate(([2 * t_s[0] - mid_s[0]] if t_s.shape[0] > 1 else [t_s[0]], mid_s, [2 * t_s[-1] - mid_s[-1]] if t_s.shape[0] > 1 else [t_s[0]]))
+    width_s = numpy.diff(edges_s)
+    coverage_pct = 100 * flat.dot(width_s) / max(edges_s[-1] - edges_s[0], 1e-300)
+    padded = numpy.ones((flat.shape[0], flat.shape[1] + 2), dtype=bool)
+    padded[:,1:-1] = flat
+    rows, kStart = numpy.nonzero(padded[:,:-2] & ~padded[:,1:-1])
+    _, kStop = numpy.nonzero(~padded[:,1:-1] & padded[:,2:])
+    gap_s = edges_s[kStop + 1] - edges_s[kStart]
+    nGaps = numpy.bincount(rows, minlength=flat.shape[0])
+    maxGap_s = numpy.zeros(flat.shape[0])
+    numpy.maximum.at(maxGap_s, rows, gap_s)
+    meanGap_s = numpy.bincount(rows, weights=gap_s, minlength=flat.shape[0]) / numpy.maximum(nGaps, 1)
+    return {'coverage_pct': coverage_pct.reshape(shape), 'maxGap_s': maxGap_s.reshape(shape), 'meanGap_s': meanGap_s.reshape(shape)}
+
+def evaluate(designs, rTargetLla_radm, t_s, minEl_rad=0, pattern='delta', isJ2=True, dtype=float):
+    """Evaluates a sweep of Walker designs (a sequence of (T, P, F, alt_m,
+       i_rad) tuples, all with the first time as epoch) against the given
+       targets over the given times, returning the (D,K) metric arrays of
+       *getMetrics* for D designs and K targets. Coverage is evaluated in the
+       given precision (see *getCoverage*).
+    """
+    t_s = numpy.asarray(t_s, dtype=float)
+    pop, groups = getSweep(designs, pattern, t_s[0], isJ2)
+    return getMetrics(getCoverage(pop, rTargetLla_radm, t_s, minEl_rad, groups, dtype=dtype), t_s)